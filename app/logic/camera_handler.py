@@ -1,10 +1,13 @@
 # app/logic/camera_handler.py
 # Модуль для управления камерой, захвата и обработки видеопотока.
 import cv2  # Библиотека OpenCV для работы с компьютерным зрением
+import numpy as np  # Для предварительно выделенных буферов кадров
 import asyncio  # Для асинхронного выполнения операций
+import os  # Для определения числа ядер CPU
+import threading  # Событие пробуждения потока чтения после паузы
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError  # Выделенный поток для всех операций с камерой
 import time # Для отслеживания времени кадра и FPS
-from PyQt5.QtCore import QObject, pyqtSignal, QSize, Qt # PySide6 -> PyQt5, Signal -> pyqtSignal
-from PyQt5.QtGui import QImage  # PySide6 -> PyQt5
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot, QSize # PySide6 -> PyQt5, Signal -> pyqtSignal, Slot -> pyqtSlot
 
 class CameraHandler(QObject):
     """
@@ -12,44 +15,285 @@ class CameraHandler(QObject):
     обработку кадров и передачу их для отображения в UI.
     Работает в асинхронном режиме, чтобы не блокировать основной поток приложения.
     """
-    # Сигнал, передающий новый обработанный кадр (в формате QImage)
-    new_frame = pyqtSignal(QImage) # Signal -> pyqtSignal
+    # Сигнал, передающий новый обработанный кадр: непрерывный numpy-массив uint8, который GUI
+    # оборачивает в QImage без конвертации: (H, W, 4) BGRA = QImage.Format_RGB32 или (H, W) для grayscale.
+    new_frame = pyqtSignal(object) # Signal -> pyqtSignal
     # Сигнал, сообщающий об ошибках, возникших при работе с камерой
     camera_error = pyqtSignal(str) # Signal -> pyqtSignal
 
-    def __init__(self, camera_index=1, capture_width=544, capture_height=288, target_display_size=QSize(400, 300), parent=None):
+    def __init__(self, camera_index=1, capture_width=544, capture_height=288, target_display_size=QSize(400, 300), buffered=False, grayscale=False, parent=None):
         """
         Инициализация обработчика камеры.
         Args:
             camera_index (int): Индекс камеры в системе. По умолчанию 1.
             capture_width (int): Целевая ширина захвата кадра с камеры.
             capture_height (int): Целевая высота захвата кадра с камеры.
-            target_display_size (QSize): Целевой размер для отображения в GUI.
+            target_display_size (QSize): Целевой размер для отображения в GUI
+                (может быть изменен во время работы через set_display_size).
+            buffered (bool): Если False (по умолчанию), буфер драйвера камеры ограничивается одним кадром,
+                чтобы при задержках UI отображался самый свежий кадр, а не накопленная очередь.
+            grayscale (bool): Если True, кадры переводятся в оттенки серого сразу после захвата
+                (1 байт на пиксель вместо 3 на всех последующих этапах обработки).
             parent (QObject, optional): Родительский объект PyQt.
         """
         super().__init__(parent)
         self.camera_index = camera_index  # Индекс камеры (по умолчанию 1 для внешней USB-камеры)
         self.capture_width = capture_width  # Ширина кадра при захвате с камеры
         self.capture_height = capture_height  # Высота кадра при захвате с камеры
+        self.buffered = buffered  # Разрешить ли драйверу камеры накапливать очередь кадров
+        self.grayscale = grayscale  # Отображать ли видео в оттенках серого (меньше данных на кадр)
         self.target_display_size = target_display_size  # Целевой размер для отображения в GUI (например, 400x300)
+        self._dst_wh = (target_display_size.width(), target_display_size.height())  # Тот же размер в виде кортежа для cv2.resize
+        # Кэш _fit_to_display: ((w, h, _dst_wh), размер вписанного кадра, метод интерполяции cv2.resize).
+        # Хранится одним кортежем, чтобы поток чтения всегда видел согласованные значения.
+        self._fit_cache = None
+        self._resize_buffer = None  # Переиспользуемый буфер для уменьшенного кадра (выделяется при первом кадре)
+        self._rot_buffer = None  # Переиспользуемый буфер для повернутого уменьшенного кадра (выделяется при первом кадре)
 
         self.cap = None  # Объект VideoCapture из OpenCV
+        self.actual_width = None  # Фактическая ширина захвата, установленная камерой (известна после открытия)
+        self.actual_height = None  # Фактическая высота захвата, установленная камерой (известна после открытия)
         self.running = False  # Флаг, управляющий основным циклом захвата кадров
         
         self.FPS_LIMIT = 20.0  # Желаемое ограничение FPS для цикла захвата (исправлено с глобальной на локальную)
-        self.last_frame_time = 0  # Время получения последнего кадра, используется для контроля FPS
+        self.last_frame_time = 0  # Время (time.monotonic) отправки последнего кадра, используется для контроля FPS
 
         # Константы для логики восстановления камеры при сбоях
         self.MAX_OPEN_ATTEMPTS = 3  # Макс. число попыток полного переоткрытия камеры
         self.MAX_READ_FAILURES = 5  # Макс. число последовательных неудачных чтений кадра перед попыткой переоткрытия
+        self.READ_TIMEOUT = 2.0  # Макс. ожидание кадра от потока чтения (сек), после чего чтение считается неудачным
+
+        # Все операции с self.cap (открытие, чтение, освобождение) выполняются в одном выделенном потоке:
+        # некоторые бэкенды VideoCapture (V4L2) не рассчитаны на обращения из разных потоков.
+        self._cam_exec = None  # ThreadPoolExecutor(max_workers=1), создается в start_capture
+        # Задача-производитель в этом потоке блокирующе читает кадры и передает их в цикл asyncio
+        # через ограниченную очередь: при заполнении самый старый кадр вытесняется новым, поэтому
+        # медленный GUI не тормозит чтение с камеры, а память и задержка остаются ограниченными.
+        self.FRAME_QUEUE_SIZE = 2  # Емкость очереди кадров (1 - минимальная задержка, 2 - сглаживание рывков)
+        self._reader = None  # Future задачи чтения кадров в self._cam_exec
+        self._release_future = None  # Future освобождения камеры, поставленного в очередь в stop_capture
+        self._loop = None  # Цикл событий asyncio, сохраняется в start_capture
+        self._task = None  # Задача asyncio с _capture_loop
+        self._reader_running = False  # Флаг, управляющий циклом потока чтения
+        # Событие, которого поток чтения ждет во время паузы (без периодических пробуждений ядра камеры).
+        # Сбрасывается в pause(), устанавливается в resume() и при остановке задачи чтения (_stop_reader).
+        self._reader_wake = threading.Event()
+        self._reader_wake.set()
+        self._frame_queue = None  # asyncio.Queue(maxsize=FRAME_QUEUE_SIZE) с парами (ret, кадр), создается в _capture_loop
+        self._stop_event = None  # asyncio.Event, устанавливается в stop_capture и прерывает паузы _capture_loop
+        self.paused = False  # Захват приостановлен (pause/resume): кадры не читаются и не обрабатываются
+        self._resume_event = None  # asyncio.Event, сброшен на время паузы
         
         self._current_open_attempts = 0  # Счетчик текущих попыток открытия/переоткрытия
         self._current_read_failures = 0  # Счетчик текущих последовательных неудачных чтений
+
+        # Настройка OpenCV: включаем оптимизированные (SIMD) реализации и ограничиваем число потоков
+        # parallel_for_ в rotate/resize, оставляя ядра для GUI, цикла asyncio и потока чтения камеры.
+        # Это глобальные настройки OpenCV; при необходимости их можно переопределить после создания обработчика.
+        cpu_count = os.cpu_count() or 1
+        cv2.setUseOptimized(True)
+        cv2.setNumThreads(max(1, cpu_count - 2))
+        # Ядра CPU, к которым привязывается поток камеры (последние ядра, по числу потоков OpenCV).
+        # Рабочие потоки OpenCV создаются из потока камеры и наследуют эту привязку, поэтому вся
+        # обработка кадров идет на этих ядрах, а первые ядра остаются GUI и QtWebEngine.
+        # None - привязка не выполняется (одно-двухъядерная система).
+        self.CAMERA_CPUS = set(range(2, cpu_count)) if cpu_count > 2 else None
         print(f"CameraHandler инициализирован: камера_индекс={self.camera_index}, "
-              f"разрешение_захвата={self.capture_width}x{self.capture_height}, FPS_лимит={self.FPS_LIMIT}, "
+              f"разрешение_захвата={self.capture_width}x{self.capture_height}, FPS_лимит={self.FPS_LIMIT}, потоки_OpenCV={cv2.getNumThreads()}, "
               f"размер_отображения={self.target_display_size.width()}x{self.target_display_size.height()}")
 
 
+    def _fit_to_display(self, w, h):
+        """
+        Возвращает размер (ширина, высота), в который нужно масштабировать кадр w x h,
+        чтобы вписать его в target_display_size с сохранением пропорций (аналог Qt.KeepAspectRatio),
+        и метод интерполяции для cv2.resize (INTER_AREA при уменьшении, INTER_LINEAR при увеличении).
+        Результат кэшируется, так как размер кадра меняется только при переоткрытии камеры,
+        а размер отображения - только при изменении размера виджета (set_display_size).
+        """
+        dst_wh = self._dst_wh # Может быть заменен из GUI-потока, читается один раз
+        key = (w, h, dst_wh)
+        cache = self._fit_cache
+        if cache is None or cache[0] != key:
+            dst_w, dst_h = dst_wh
+            scale = min(dst_w / w, dst_h / h)
+            fit_wh = (max(1, round(w * scale)), max(1, round(h * scale)))
+            cache = self._fit_cache = (key, fit_wh, cv2.INTER_AREA if scale <= 1 else cv2.INTER_LINEAR)
+        return cache[1], cache[2]
+
+    @pyqtSlot(QSize) # Slot -> pyqtSlot
+    def set_display_size(self, size):
+        """
+        Устанавливает новый размер области отображения (например, при изменении размера виджета),
+        чтобы кадры масштабировались в OpenCV сразу до него и GUI не масштабировал их при отрисовке.
+        Args:
+            size (QSize): Размер области отображения в пикселях.
+        """
+        if size.width() <= 0 or size.height() <= 0:
+            return # Виджет еще не размещен
+        self.target_display_size = QSize(size)
+        self._dst_wh = (size.width(), size.height()) # Один атомарный кортеж, читаемый потоком чтения
+
+    def _resize_frame(self, frame, size, interpolation):
+        """
+        Масштабирует кадр до size (ширина, высота) в заранее выделенный буфер.
+        Как и буфер поворота, буфер пересоздается только при изменении размера
+        (размера виджета или числа каналов), а не на каждом кадре.
+        """
+        resized_shape = (size[1], size[0]) + frame.shape[2:]
+        if self._resize_buffer is None or self._resize_buffer.shape != resized_shape:
+            self._resize_buffer = np.empty(resized_shape, dtype=frame.dtype)
+        return cv2.resize(frame, size, dst=self._resize_buffer, interpolation=interpolation)
+
+    def _rotate_frame(self, frame):
+        """
+        Поворачивает кадр на 90 градусов против часовой стрелки в заранее выделенный буфер.
+        Буфер создается один раз и пересоздается только при изменении размера кадра,
+        что избавляет от выделения памяти под полный кадр на каждой итерации.
+        """
+        h, w = frame.shape[:2]
+        rotated_shape = (w, h) + frame.shape[2:]
+        if self._rot_buffer is None or self._rot_buffer.shape != rotated_shape:
+            self._rot_buffer = np.empty(rotated_shape, dtype=frame.dtype)
+        return cv2.rotate(frame, cv2.ROTATE_90_COUNTERCLOCKWISE, dst=self._rot_buffer)
+
+    def _process_frame(self, frame):
+        """
+        Подготавливает кадр OpenCV к отображению: масштабирование, поворот и перевод в формат отображения.
+        Выполняется в потоке чтения, чтобы обработка пикселей не занимала цикл событий asyncio (и GUI-поток).
+        Возвращает непрерывный numpy-массив (см. new_frame) или None, если кадр не удалось обработать.
+        """
+        if self.grayscale:
+            # Перевод в оттенки серого до поворота и масштабирования: дальше обрабатывается 1 канал вместо 3.
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+        # Масштабирование до размера отображения выполняется в OpenCV (cv2.resize),
+        # который использует SIMD и многопоточность, вместо скалярного QImage.scaled(SmoothTransformation).
+        # INTER_AREA дает лучшее качество и скорость при уменьшении кадра.
+        # Кадр масштабируется до поворота: размер вписывания считается для уже повернутого кадра (h x w),
+        # а затем стороны меняются местами. Так поворот выполняется над уменьшенным кадром.
+        # Если камера уже отдает кадр нужного размера (capture_width/height подобраны под
+        # target_display_size с учетом поворота), масштабирование пропускается.
+        h, w = frame.shape[:2]
+        (dst_w, dst_h), interpolation = self._fit_to_display(h, w)
+        if (dst_h, dst_w) == (w, h):
+            small_frame = frame
+        else:
+            small_frame = self._resize_frame(frame, (dst_h, dst_w), interpolation)
+
+        # Поворот кадра на 90 градусов против часовой стрелки.
+        # Это может быть необходимо для некоторых USB-камер, которые по умолчанию дают перевернутое изображение.
+        # Результат пишется в переиспользуемый буфер, который перезаписывается на следующем кадре.
+        try:
+            small_frame = self._rotate_frame(small_frame)
+        except Exception as e:
+            print(f"Камера {self.camera_index}: Ошибка при повороте кадра: {e}")
+            return None # Пропускаем этот кадр, если поворот не удался
+
+        # Буфер поворота перезаписывается следующим кадром, поэтому GUI получает отдельный массив.
+        # Цветной кадр сразу переводится в BGRA: в памяти это нативный формат QPixmap (QImage.Format_RGB32
+        # на little-endian), и QPixmap.fromImage в GUI-потоке не делает отдельного прохода конвертации.
+        # cv2.cvtColor пишет в новый непрерывный массив, заменяя прежнее копирование QImage.copy().
+        if self.grayscale:
+            return small_frame.copy()
+        return cv2.cvtColor(small_frame, cv2.COLOR_BGR2BGRA)
+
+    def _reader_thread(self, loop):
+        """
+        Цикл задачи-производителя (выполняется в потоке камеры): блокирующе читает кадры из self.cap,
+        готовит из них кадры для отображения (_process_frame) и передает результат в цикл событий asyncio
+        через call_soon_threadsafe, без отдельного перехода в пул потоков на каждый кадр.
+        Завершается, когда сброшен флаг self._reader_running; до этого поток камеры занят,
+        поэтому следующие операции с камерой в self._cam_exec выполняются только после выхода из цикла.
+        """
+        cap = self.cap
+        while self._reader_running:
+            if self.paused:
+                self._reader_wake.wait() # Во время паузы cap.read() не вызывается, поток спит до resume/остановки
+                continue
+            try:
+                ret, frame = cap.read()
+                if not self._reader_running:
+                    break
+                display_frame = self._process_frame(frame) if ret else None
+            except Exception as e:
+                # Исключение не должно молча завершать задачу чтения (Future в self._reader никто не ждет):
+                # ошибка выводится, а в цикл событий передается неудачное чтение, которое учитывается
+                # в _current_read_failures и при повторении приводит к переоткрытию камеры.
+                print(f"Камера {self.camera_index}: Ошибка в потоке чтения: {e}")
+                ret, display_frame = False, None
+            try:
+                loop.call_soon_threadsafe(self._put_latest_frame, ret, display_frame)
+            except RuntimeError:
+                break # Цикл событий уже закрыт (завершение приложения)
+            if not ret:
+                time.sleep(0.03) # Не загружаем CPU частыми повторами, пока камера не отдает кадры
+
+    def _put_latest_frame(self, ret, display_frame):
+        """
+        Выполняется в потоке цикла asyncio. Кладет результат чтения в очередь;
+        если очередь заполнена, вытесняет самый старый необработанный кадр (latest-wins).
+        """
+        if self._frame_queue.full():
+            self._frame_queue.get_nowait()
+        self._frame_queue.put_nowait((ret, display_frame))
+
+    def _start_reader(self):
+        """
+        Запускает задачу чтения кадров для текущего self.cap в потоке камеры.
+        Returns:
+            bool: False, если захват уже остановлен и поток камеры завершается.
+        """
+        if not self.running or self._cam_exec is None:
+            return False
+        self._reader_running = True
+        if self.paused:
+            self._reader_wake.clear() # Предыдущая задача чтения могла быть разбужена в _stop_reader
+        self._reader = self._cam_exec.submit(self._reader_thread, self._loop)
+        return True
+
+    def _stop_reader(self):
+        """
+        Просит задачу чтения завершиться: сбрасывает флаг цикла и будит поток, если он ждет в паузе,
+        чтобы следующие операции в потоке камеры (открытие, release) не ждали resume().
+        """
+        self._reader_running = False
+        self._reader_wake.set()
+
+    def _pin_camera_thread(self):
+        """
+        Выполняется при запуске потока камеры: привязывает его к ядрам CAMERA_CPUS, чтобы блокирующие
+        cap.read() и обработка кадров не конкурировали с GUI-потоком за одно ядро.
+        В Linux sched_setaffinity(0, ...) применяется только к вызывающему потоку.
+        """
+        if self.CAMERA_CPUS is None or not hasattr(os, 'sched_setaffinity'):
+            return
+        try:
+            os.sched_setaffinity(0, self.CAMERA_CPUS)
+        except OSError as e:
+            print(f"Камера {self.camera_index}: Не удалось привязать поток камеры к ядрам {sorted(self.CAMERA_CPUS)}: {e}")
+
+    def _run_on_camera_thread(self, func, *args):
+        """
+        Выполняет блокирующую функцию в потоке камеры и возвращает awaitable с результатом.
+        Задача чтения должна быть предварительно остановлена (_stop_reader),
+        иначе вызов будет ждать ее завершения.
+        """
+        return self._loop.run_in_executor(self._cam_exec, func, *args)
+
+    def _release_sync(self):
+        """
+        Освобождает self.cap. Выполняется в потоке камеры, то есть строго после завершения
+        задачи чтения, поэтому release никогда не пересекается с cap.read().
+        """
+        self._reader = None
+        if self.cap:
+            try:
+                self.cap.release()
+            except Exception as e:
+                print(f"Камера {self.camera_index}: Исключение при self.cap.release(): {e}")
+            self.cap = None
+
     async def _try_system_level_restart(self):
         """
         Заглушка для попытки системного перезапуска камеры.
@@ -61,6 +305,18 @@ class CameraHandler(QObject):
         self.camera_error.emit(error_message)
         return False # Возвращает False, так как реальный перезапуск не выполнен
 
+    async def _wait_or_stop(self, delay):
+        """
+        Пауза на delay секунд, которая прерывается сразу при вызове stop_capture.
+        Returns:
+            bool: True, если захват был остановлен во время паузы.
+        """
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), delay)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
     def start_capture(self):
         """
         Запускает процесс захвата видео с камеры.
@@ -70,8 +326,21 @@ class CameraHandler(QObject):
         self.running = True
         self._current_open_attempts = 0
         self._current_read_failures = 0
-        # asyncio.create_task() планирует выполнение _capture_loop() в цикле событий asyncio
-        asyncio.create_task(self._capture_loop())
+        if self._cam_exec is None:
+            # Рабочий поток ThreadPoolExecutor не является демоном: при выходе интерпретатора
+            # concurrent.futures дожидается его завершения. Зависший cap.read() (например, отключенная
+            # USB-камера) поэтому задерживает завершение процесса без ограничения по времени (см. wait_released).
+            self._cam_exec = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"camera-{self.camera_index}",
+                                                initializer=self._pin_camera_thread)
+        self._stop_event = asyncio.Event()
+        self._resume_event = asyncio.Event()
+        if not self.paused:
+            self._resume_event.set()
+        # Задача _capture_loop() планируется через сохраненный цикл событий (как GPIOController._loop),
+        # поэтому start_capture можно вызывать и до запуска цикла.
+        # Ссылка на задачу сохраняется, чтобы stop_capture мог прервать ее ожидания через _stop_event.
+        self._loop = asyncio.get_event_loop()
+        self._task = self._loop.create_task(self._capture_loop())
         print(f"Камера {self.camera_index}: Запуск захвата видео.")
 
     def stop_capture(self):
@@ -80,69 +349,146 @@ class CameraHandler(QObject):
         Сбрасывает флаг self.running и освобождает ресурсы камеры.
         """
         self.running = False
-        if self.cap:
-            # Выполняем release в отдельном потоке, так как это может быть блокирующей операцией
-            # Хотя обычно это быстро, но для единообразия с cap.read() и cap.open()
-            try:
-                # Не используем await здесь, т.к. stop_capture - синхронный метод.
-                # Если бы stop_capture был async, можно было бы await asyncio.to_thread(self.cap.release)
-                # В данном контексте, если release блокирует надолго, это может вызвать проблемы
-                # при быстром закрытии приложения. Однако, обычно это не так.
-                self.cap.release()
-            except Exception as e:
-                print(f"Камера {self.camera_index}: Исключение при self.cap.release(): {e}")
-            self.cap = None
+        self._stop_reader()
+        # Прерываем текущее ожидание _capture_loop (паузу между попытками или ожидание кадра),
+        # чтобы остановка вступала в силу сразу, а не после истечения таймаута.
+        if self._stop_event:
+            self._stop_event.set()
+        if self._resume_event:
+            self._resume_event.set()
+        if self._frame_queue:
+            self._put_latest_frame(False, None)
+        if self._cam_exec:
+            # release ставится в очередь потока камеры и выполнится сразу после выхода задачи чтения
+            # из cap.read(), без блокировки вызывающего (GUI) потока. shutdown(wait=False) не отменяет
+            # уже поставленные задачи, а лишь завершает поток после их выполнения.
+            self._release_future = self._cam_exec.submit(self._release_sync)
+            self._cam_exec.shutdown(wait=False)
+            self._cam_exec = None
         print(f"Камера {self.camera_index}: Остановка захвата видео.")
 
+    def pause(self):
+        """
+        Приостанавливает захват (например, когда окно скрыто): поток чтения перестает вызывать
+        cap.read() и обрабатывать кадры, сигналы new_frame не отправляются. Камера остается открытой.
+        """
+        if not self.running or self.paused: # Остановленный захват (например, hideEvent после closeEvent)
+            return
+        self.paused = True
+        if self._reader_running: # Остановленную задачу чтения не усыпляем: ее уже разбудил _stop_reader
+            self._reader_wake.clear()
+        if self._resume_event:
+            self._resume_event.clear()
+        print(f"Камера {self.camera_index}: Захват приостановлен.")
+
+    def resume(self):
+        """Возобновляет захват, приостановленный pause()."""
+        if not self.running or not self.paused:
+            return
+        self.paused = False
+        self._reader_wake.set()
+        if self._resume_event:
+            self._resume_event.set()
+        print(f"Камера {self.camera_index}: Захват возобновлен.")
+
+    def wait_released(self, timeout=2.0):
+        """
+        Блокирующе дожидается освобождения камеры, поставленного в очередь потока камеры в stop_capture.
+        Вызывается при завершении приложения (MainWindow.closeEvent), чтобы VideoCapture был освобожден
+        до выхода интерпретатора. Release выполняется сразу после выхода задачи чтения из текущего
+        cap.read(), то есть обычно через время одного кадра; ожидание ограничено timeout секундами.
+        timeout ограничивает только это ожидание, а не время завершения процесса: если cap.read() завис,
+        выход интерпретатора все равно будет ждать поток камеры (он не является демоном).
+        """
+        if self._release_future is None:
+            return
+        try:
+            self._release_future.result(timeout=timeout)
+        except FutureTimeoutError:
+            print(f"Камера {self.camera_index}: Камера не освобождена за {timeout} с (поток камеры, вероятно, "
+                  f"завис в cap.read()). Завершение процесса может зависнуть до выхода из cap.read().")
+        self._release_future = None
+
+    def _open_sync(self):
+        """
+        Блокирующая часть (пере)открытия камеры, выполняемая одним вызовом в потоке камеры:
+        освобождение предыдущего VideoCapture, открытие камеры, установка параметров
+        и чтение фактического разрешения.
+        Открытая камера сохраняется в self.cap здесь же, в потоке камеры: release, поставленный
+        в очередь stop_capture во время открытия, выполнится после этой функции и освободит именно ее.
+        Если захват остановлен, пока камера открывалась, новая камера сразу освобождается.
+        Возвращает (actual_width, actual_height) при успехе или None, если камеру открыть не удалось.
+        """
+        self._release_sync() # Освобождаем предыдущий экземпляр, если был
+
+        cap = cv2.VideoCapture(self.camera_index)
+        if not cap.isOpened():
+            cap.release() # Объект создался, но камера не открылась
+            return None
+
+        # Установка желаемой ширины и высоты кадра.
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.capture_width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.capture_height)
+        if not self.buffered:
+            # Буфер драйвера на 1 кадр: устаревшие кадры не накапливаются (поддерживается не всеми бэкендами)
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        if not self.running: # stop_capture вызван во время открытия
+            cap.release()
+            return None
+        self.cap = cap
+        # Фактические значения могут отличаться от запрошенных, если камера не поддерживает режим.
+        return int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
     async def _attempt_open_camera(self):
-        """Попытка открыть камеру и установить параметры."""
+        """
+        Попытка открыть камеру и установить параметры.
+        Все блокирующие вызовы OpenCV выполняются одним переходом в поток камеры (_open_sync).
+        """
+        if not self.running: # Захват остановлен (stop_capture), поток камеры уже завершается
+            return False
         print(f"Камера {self.camera_index}: Попытка открытия (попытка {self._current_open_attempts + 1}/{self.MAX_OPEN_ATTEMPTS})...")
-        if self.cap:
-            await asyncio.to_thread(self.cap.release) # Освобождаем предыдущий экземпляр, если был
-            self.cap = None
-
-        # self.cap = cv2.VideoCapture(self.camera_index) # Синхронный вызов
-        self.cap = await asyncio.to_thread(cv2.VideoCapture, self.camera_index) # Асинхронный вызов
+        self._stop_reader() # Задача чтения должна завершиться, чтобы освободить поток камеры
+        opened = await self._run_on_camera_thread(self._open_sync)
+        if not self.running or self._cam_exec is None:
+            # stop_capture вызван во время открытия: открытую камеру освобождает release,
+            # поставленный им в очередь потока камеры, задачу чтения запускать уже некуда.
+            return False
 
-        if self.cap and self.cap.isOpened():
-            print(f"Камера {self.camera_index}: Успешно открыта. Установка параметров разрешения захвата ({self.capture_width}x{self.capture_height})...")
-            # Установка желаемой ширины и высоты кадра. Это также блокирующие операции.
-            await asyncio.to_thread(self.cap.set, cv2.CAP_PROP_FRAME_WIDTH, self.capture_width)
-            await asyncio.to_thread(self.cap.set, cv2.CAP_PROP_FRAME_HEIGHT, self.capture_height)
-            
-            # (Опционально) Проверка установленных значений (может отличаться от запрошенных, если камера не поддерживает)
-            # actual_width = await asyncio.to_thread(self.cap.get, cv2.CAP_PROP_FRAME_WIDTH)
-            # actual_height = await asyncio.to_thread(self.cap.get, cv2.CAP_PROP_FRAME_HEIGHT)
-            # print(f"Камера {self.camera_index}: Запрошено {self.capture_width}x{self.capture_height}, фактическое {actual_width}x{actual_height}.")
-            
-            print(f"Камера {self.camera_index}: Параметры разрешения установлены.")
+        if opened:
+            # Фактический размер сохраняется, чтобы заранее знать, понадобится ли масштабирование кадров.
+            self.actual_width, self.actual_height = opened
+            print(f"Камера {self.camera_index}: Успешно открыта. Параметры разрешения установлены "
+                  f"(запрошено {self.capture_width}x{self.capture_height}, фактическое {self.actual_width}x{self.actual_height}).")
             self._current_open_attempts = 0  # Сброс счетчика попыток открытия при успехе
             self._current_read_failures = 0  # Также сбрасываем ошибки чтения, т.к. камера успешно (пере)открыта
-            return True
+            return self._start_reader()
         else:
             print(f"Камера {self.camera_index}: Не удалось открыть.")
-            if self.cap: # Если объект создался, но не открылся
-                 await asyncio.to_thread(self.cap.release)
-                 self.cap = None
             return False
 
     async def _capture_loop(self):
         """
         Асинхронный метод, представляющий основной цикл захвата и обработки кадров.
         Включает логику повторных попыток открытия и чтения кадров.
+        Кадры поступают из потока чтения (_reader_thread) через очередь self._frame_queue.
         """
+        self._frame_queue = asyncio.Queue(maxsize=self.FRAME_QUEUE_SIZE)
+
         # Начальная попытка открыть камеру
         if not await self._attempt_open_camera():
             self._current_open_attempts += 1
             # Если первая попытка не удалась, попробуем еще несколько раз перед полным отказом
             while self.running and self._current_open_attempts < self.MAX_OPEN_ATTEMPTS:
-                await asyncio.sleep(2) # Пауза перед следующей попыткой открытия
+                if await self._wait_or_stop(2): # Пауза перед следующей попыткой открытия
+                    break
                 if not await self._attempt_open_camera():
                     self._current_open_attempts += 1
                 else:
                     break # Успешно открыли, выходим из цикла попыток открытия
             
-            if not (self.cap and self.cap.isOpened()):
+            if not self.running: # Захват остановлен во время попыток открытия
+                return
+            if self.cap is None:
                 error_msg = f"Не удалось открыть камеру {self.camera_index} после {self._current_open_attempts} попыток."
                 print(error_msg)
                 self.camera_error.emit(error_msg)
@@ -153,39 +499,51 @@ class CameraHandler(QObject):
 
         # Основной цикл чтения кадров
         while self.running:
-            if not (self.cap and self.cap.isOpened()):
+            # Методы self.cap здесь не вызываются: объектом VideoCapture владеет только поток камеры.
+            # Закрывшаяся камера проявится как ошибки чтения в задаче-производителе.
+            if self.cap is None:
                 # Это условие не должно часто срабатывать, если камера была успешно открыта,
-                # но на случай, если камера "отвалилась" без ошибки чтения.
+                # но на случай, если камера была освобождена без ошибки чтения.
                 print(f"Камера {self.camera_index}: Внезапно обнаружена закрытой перед чтением.")
                 self.camera_error.emit("Камера неожиданно закрылась.")
                 self._current_read_failures = self.MAX_READ_FAILURES # Форсируем логику восстановления
             else:
-                ret, frame = await asyncio.to_thread(self.cap.read) # Чтение кадра в отдельном потоке
+                if not self._resume_event.is_set():
+                    # Пауза: ожидание не считается ошибкой чтения, кадры, полученные до паузы, отбрасываются
+                    await self._resume_event.wait()
+                    while not self._frame_queue.empty():
+                        self._frame_queue.get_nowait()
+                    if not self.running:
+                        break
+                    continue
+                # Ожидание очередного готового кадра от потока чтения. Темп задает сама камера,
+                # поэтому фиксированная пауза между кадрами не нужна.
+                try:
+                    ret, display_frame = await asyncio.wait_for(self._frame_queue.get(), self.READ_TIMEOUT)
+                except asyncio.TimeoutError:
+                    if not self._resume_event.is_set():
+                        continue # Таймаут из-за pause() во время ожидания: это не ошибка чтения
+                    ret, display_frame = False, None # Камера "зависла" в cap.read(), считаем чтение неудачным
+                if not self.running:
+                    break
 
                 if ret:
                     self._current_read_failures = 0 # Сброс ошибок чтения при успехе
                     # self._current_open_attempts = 0 # Камера работает, все попытки открытия сброшены
                                                    # Сбрасывается в _attempt_open_camera
                     
-                    # Поворот кадра на 90 градусов против часовой стрелки.
-                    # Это может быть необходимо для некоторых USB-камер, которые по умолчанию дают перевернутое изображение.
-                    try:
-                        rotated_frame = cv2.rotate(frame, cv2.ROTATE_90_COUNTERCLOCKWISE)
-                    except Exception as e:
-                        print(f"Камера {self.camera_index}: Ошибка при повороте кадра: {e}")
-                        # Пропускаем этот кадр, если поворот не удался
-                        # Управление FPS нижезаботится о задержке
-                        await asyncio.sleep(0.01) # Небольшая пауза
-                        continue 
-                    # === Конец интеграции кода пользователя ===
-                    
-                    # Конвертация повернутого кадра из BGR (OpenCV) в RGB.
-                    rgb_image = cv2.cvtColor(rotated_frame, cv2.COLOR_BGR2RGB)
-                    h, w, ch = rgb_image.shape
-                    bytes_per_line = ch * w
-                    qt_image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format_RGB888)
-                    qt_image_scaled = qt_image.scaled(self.target_display_size, Qt.KeepAspectRatio, Qt.SmoothTransformation) # Qt.AspectRatioMode.* -> Qt.*, Qt.TransformationMode.* -> Qt.*
-                    self.new_frame.emit(qt_image_scaled)
+                    if display_frame is None:
+                        continue # Кадр получен, но не обработан (ошибка уже выведена в потоке чтения)
+
+                    self.new_frame.emit(display_frame)
+
+                    # Ограничение FPS по дедлайну: спим только оставшуюся часть интервала 1/FPS_LIMIT,
+                    # учитывая время, уже затраченное на обработку кадра. Кадры, пришедшие за это время,
+                    # вытесняются в очереди, и следующим обрабатывается самый свежий.
+                    sleep_for = self.last_frame_time + 1.0 / self.FPS_LIMIT - time.monotonic()
+                    if sleep_for > 0:
+                        await asyncio.sleep(sleep_for)
+                    self.last_frame_time = time.monotonic()
                 else:
                     # Кадр не получен
                     self._current_read_failures += 1
@@ -211,14 +569,11 @@ class CameraHandler(QObject):
                         break 
                     else:
                         # Даем шанс следующей итерации внешнего while self.running после паузы
-                        await asyncio.sleep(1) # Короткая пауза перед следующей попыткой в цикле while self.running
+                        await self._wait_or_stop(1) # Короткая пауза перед следующей попыткой в цикле while self.running
 
-            if self.running: # Если не остановили цикл из-за критического сбоя
-                await asyncio.sleep(0.03) # Пауза для контроля FPS и предоставления времени другим задачам
-        
         # Очистка при завершении цикла (если он не был прерван исключением)
-        if self.cap and self.cap.isOpened():
+        self._stop_reader()
+        if self._cam_exec: # Иначе освобождение камеры уже поставлено в очередь в stop_capture
             print(f"Камера {self.camera_index}: Освобождение ресурсов в конце _capture_loop.")
-            await asyncio.to_thread(self.cap.release)
-        self.cap = None
+            await self._run_on_camera_thread(self._release_sync)
         print(f"Камера {self.camera_index}: Завершение работы _capture_loop (running={self.running}).")
@@ -12,12 +12,63 @@
 #   sudo apt-get install mpg123 notify-osd
 #   (notify-osd обычно предоставляет команду notify-send)
 # Убедитесь также, что файл /home/pi/Music/Gong.mp3 существует, или измените путь.
+#
+# Кнопка Shutdown (GPIO17) по возможности читается напрямую через символьное устройство
+# /dev/gpiochipN (Python-привязки libgpiod v2, пакет 'gpiod'): ядро само отслеживает фронт,
+# а событие приходит в цикл asyncio через файловый дескриптор (loop.add_reader), без фоновых потоков.
+# Если пакет gpiod не установлен или линия недоступна, используется gpiozero.Button.
+#   pip install gpiod
 
 import asyncio
-# import os # Закомментировано/удалено, т.к. os.system был заменен на asyncio.create_subprocess_shell
+import os # Для поиска процесса chromium в /proc и отправки сигнала
+import signal # SIGTERM для завершения процесса chromium
+import functools # partialmethod для методов-совместимости control_gpio_N
+import shutil # Для однократного поиска путей к внешним утилитам (mpg123, notify-send)
+import subprocess # Постоянный процесс mpg123 в режиме удаленного управления (-R)
+from datetime import timedelta # Период аппаратного антидребезга для gpiod
 from PyQt5.QtCore import QObject, pyqtSignal # PySide6 -> PyQt5, Signal -> pyqtSignal
 from gpiozero import Button # Класс для работы с физическими кнопками
 
+try:
+    import gpiod # libgpiod v2: прямой доступ к /dev/gpiochipN с событиями фронтов от ядра
+    from gpiod.line import Bias, Direction, Edge
+except ImportError:
+    gpiod = None # Необязательная зависимость, при ее отсутствии используется gpiozero
+
+def _kill_oldest(name):
+    """
+    Аналог 'pkill -o name' без запуска внешнего процесса: находит в /proc самый старый процесс,
+    имя которого (/proc/<pid>/comm) содержит name, и отправляет ему SIGTERM.
+    Блокирующая функция (чтение /proc), выполняется в пуле потоков цикла (run_in_executor).
+    Args:
+        name (str): Подстрока имени процесса (например, 'chromium').
+    Returns:
+        bool: True, если процесс найден и сигнал отправлен, иначе False.
+    """
+    oldest = None # (время запуска в тиках с момента загрузки системы, pid)
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/comm') as f:
+                if name not in f.read():
+                    continue
+            with open(f'/proc/{entry}/stat') as f:
+                # Поле 22 (starttime) идет после имени процесса в скобках, которое может содержать пробелы.
+                start_time = int(f.read().rsplit(')', 1)[1].split()[19])
+        except (OSError, ValueError, IndexError):
+            continue # Процесс завершился во время сканирования или недоступен
+        if oldest is None or start_time < oldest[0]:
+            oldest = (start_time, int(entry))
+
+    if oldest is None:
+        return False
+    try:
+        os.kill(oldest[1], signal.SIGTERM)
+    except ProcessLookupError:
+        return False # Процесс успел завершиться сам
+    return True
+
 class GPIOController(QObject):
     """
     Класс GPIOController управляет взаимодействием с GPIO Raspberry Pi.
@@ -28,6 +79,20 @@ class GPIOController(QObject):
     # Передает строку с сообщением о результате.
     shutdown_action_finished = pyqtSignal(str) # Signal -> pyqtSignal
 
+    # Звуковой сигнал, проигрываемый при нажатии кнопки Shutdown.
+    GONG_PATH = '/home/pi/Music/Gong.mp3'
+
+    # Номера управляемых GPIO-каналов (заглушки), порядок соответствует битам маски в control_many.
+    CONTROL_CHANNELS = (2, 3, 4)
+
+    # Параметры кнопки Shutdown для прямого доступа через gpiod.
+    SHUTDOWN_PIN = 17
+    GPIO_CHIP = '/dev/gpiochip0'
+    # Антидребезг выполняется ядром (gpiod) или gpiozero: дребезг контактов короче 50 мс не считается нажатием.
+    DEBOUNCE_PERIOD = timedelta(milliseconds=50)
+    # Для gpiozero: кнопка должна удерживаться не менее 0.1 с, чтобы короткие помехи не запускали действие.
+    HOLD_TIME = 0.1
+
     def __init__(self, parent=None):
         """
         Инициализация контроллера GPIO.
@@ -36,16 +101,40 @@ class GPIOController(QObject):
             parent (QObject, optional): Родительский объект PyQt.
         """
         super().__init__(parent)
+
+        # Пути к внешним утилитам определяются один раз при запуске, а не при каждом нажатии кнопки.
+        # None означает, что утилита не установлена; соответствующий шаг действия будет пропущен.
+        self._mpg123_path = shutil.which('mpg123')
+        self._notify_send_path = shutil.which('notify-send')
+        # mpg123 в режиме удаленного управления ждет команд на stdin, поэтому при повторных нажатиях
+        # не нужно создавать процесс и заново открывать ALSA. Процесс запускается при первом
+        # проигрывании (_play_gong), а не здесь: без работающей кнопки он не нужен.
+        self._player = None
         
         self.shutdown_button = None # Атрибут для объекта кнопки, инициализируется как None
+        self._button_request = None # Запрос линии GPIO17 через gpiod (если используется)
+        # Цикл событий (поток GUI): в нем регистрируется дескриптор линии gpiod и в него же
+        # передаются колбэки gpiozero, которые вызываются во внутреннем потоке gpiozero.
+        self._loop = asyncio.get_event_loop()
+        # True, пока выполняется _handle_shutdown_action: повторные нажатия в это время игнорируются,
+        # чтобы одно физическое нажатие не запускало несколько наборов подпроцессов.
+        self._action_in_progress = False
+        if self._init_gpiod_button():
+            print("GPIOController: Кнопка Shutdown (GPIO17) успешно инициализирована (gpiod).")
+            print("GPIOController: Инициализация завершена.")
+            return
+
         try:
             # Инициализация кнопки на GPIO 17.
             # pull_up=True: Используется внутренний подтягивающий резистор к 3.3V.
             # Кнопка должна быть подключена между GPIO 17 и GND.
             # При нажатии кнопки пин замыкается на GND.
-            self.shutdown_button = Button(17, pull_up=True) 
-            # Связывание события нажатия кнопки с методом-обработчиком.
-            self.shutdown_button.when_pressed = self.on_shutdown_button_pressed
+            # bounce_time: антидребезг, hold_time: минимальная длительность нажатия для срабатывания.
+            self.shutdown_button = Button(17, pull_up=True,
+                                          bounce_time=self.DEBOUNCE_PERIOD.total_seconds(),
+                                          hold_time=self.HOLD_TIME)
+            # Связывание события удержания кнопки (не просто фронта) с методом-обработчиком.
+            self.shutdown_button.when_held = self._on_button_held
             print("GPIOController: Кнопка Shutdown (GPIO17) успешно инициализирована.")
         except Exception as e:
             # Обработка возможных исключений при инициализации gpiozero:
@@ -61,15 +150,70 @@ class GPIOController(QObject):
         # ... (здесь может быть инициализация других GPIO компонентов в будущем) ...
         print("GPIOController: Инициализация завершена.")
 
+    def _init_gpiod_button(self):
+        """
+        Запрашивает линию GPIO17 у ядра через gpiod с детектированием спадающего фронта
+        (нажатие замыкает пин на GND) и антидребезгом в ядре, и регистрирует ее файловый
+        дескриптор в цикле событий. Пока кнопка не нажата, приложение не просыпается.
+        Returns:
+            bool: True, если кнопка настроена через gpiod, иначе False (используется gpiozero).
+        """
+        if gpiod is None:
+            return False
+        try:
+            self._button_request = gpiod.request_lines(
+                self.GPIO_CHIP,
+                consumer='shutdown-btn',
+                config={
+                    self.SHUTDOWN_PIN: gpiod.LineSettings(
+                        direction=Direction.INPUT,
+                        bias=Bias.PULL_UP,
+                        edge_detection=Edge.FALLING,
+                        debounce_period=self.DEBOUNCE_PERIOD,
+                    )
+                },
+            )
+            self._loop.add_reader(self._button_request.fd, self._on_button_edge)
+            return True
+        except Exception as e:
+            print(f"GPIOController: gpiod недоступен для GPIO17 ({e}), используется gpiozero.")
+            if self._button_request:
+                self._button_request.release()
+                self._button_request = None
+            return False
+
+    def _on_button_edge(self):
+        """
+        Вызывается циклом событий, когда на дескрипторе линии gpiod есть события фронтов.
+        Вычитывает все накопленные события и обрабатывает их как одно нажатие.
+        """
+        if self._button_request.read_edge_events():
+            self.on_shutdown_button_pressed()
+
+    def _on_button_held(self):
+        """
+        Колбэк gpiozero (when_held), выполняется во внутреннем потоке gpiozero.
+        Создание задач asyncio и сигналы Qt должны вызываться в потоке цикла событий,
+        поэтому обработка передается туда через call_soon_threadsafe.
+        """
+        self._loop.call_soon_threadsafe(self.on_shutdown_button_pressed)
+
     def on_shutdown_button_pressed(self):
         """
-        Синхронный колбэк, вызываемый библиотекой gpiozero при нажатии физической кнопки.
+        Синхронный обработчик нажатия физической кнопки (gpiozero через _on_button_held или событие gpiod),
+        всегда выполняется в потоке цикла событий.
         Запускает асинхронную задачу для выполнения основных действий.
         """
-        if self.shutdown_button: # Проверка, что кнопка была успешно инициализирована
+        if self.shutdown_button or self._button_request: # Проверка, что кнопка была успешно инициализирована
+            if self._action_in_progress:
+                print("GPIOController: Кнопка Shutdown (GPIO17) нажата повторно во время выполнения действия, игнорируется.")
+                return
             print("GPIOController: Кнопка Shutdown (GPIO17) нажата.")
-            # Запускаем асинхронную задачу для выполнения действий, чтобы не блокировать колбэк gpiozero
-            asyncio.create_task(self._handle_shutdown_action())
+            self._action_in_progress = True
+            # Запускаем асинхронную задачу для выполнения действий, чтобы не блокировать колбэк gpiozero.
+            # Задача создается через сохраненный цикл self._loop: asyncio.create_task требует
+            # зарегистрированного работающего цикла.
+            self._loop.create_task(self._handle_shutdown_action())
         else:
             message = "GPIOController: Кнопка Shutdown (GPIO17) не была инициализирована или ошибка при инициализации."
             print(message)
@@ -77,6 +221,59 @@ class GPIOController(QObject):
             self.shutdown_action_finished.emit(message)
 
 
+    def _start_player(self):
+        """
+        Запускает постоянный процесс 'mpg123 -R' (remote mode), принимающий команды через stdin.
+        Returns:
+            subprocess.Popen | None: Процесс проигрывателя или None, если mpg123 недоступен.
+        """
+        if self._mpg123_path is None:
+            return None
+        try:
+            return subprocess.Popen([self._mpg123_path, '-R', '--quiet'],
+                                    stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError as e:
+            print(f"GPIOController: Не удалось запустить mpg123 в режиме -R: {e}")
+            return None
+
+    def _play_gong(self):
+        """
+        Отправляет постоянному процессу mpg123 команду проигрывания звука (без ожидания окончания).
+        Процесс запускается при первом вызове (и заново, если он завершился).
+        Returns:
+            bool: True, если команда отправлена; False, если проигрыватель запустить не удалось.
+        """
+        if self._player is None or self._player.poll() is not None:
+            self._player = self._start_player()
+            if self._player is None:
+                return False
+        try:
+            self._player.stdin.write(f'LOAD {self.GONG_PATH}\n'.encode())
+            self._player.stdin.flush()
+            return True
+        except OSError: # BrokenPipeError: процесс mpg123 завершился
+            self._player = None
+            return False
+
+    async def _run_command(self, path, name, *args):
+        """
+        Запускает внешнюю программу без оболочки (create_subprocess_exec) и дожидается ее завершения.
+        Args:
+            path (str | None): Полный путь к программе (результат shutil.which) или None, если она не найдена.
+            name (str): Имя программы для сообщений в консоли.
+            *args: Аргументы командной строки.
+        Returns:
+            int | None: Код возврата программы или None, если программа не установлена.
+        """
+        if path is None:
+            print(f"GPIOController: Утилита '{name}' не найдена, шаг пропущен.")
+            return None
+        # Вывод программ не используется: DEVNULL вместо каналов, без задач чтения stdout/stderr.
+        process = await asyncio.create_subprocess_exec(path, *args,
+                                                       stdout=asyncio.subprocess.DEVNULL,
+                                                       stderr=asyncio.subprocess.DEVNULL)
+        return await process.wait()
+
     async def _handle_shutdown_action(self):
         """
         Асинхронный метод, выполняющий основную логику закрытия браузера Chromium
@@ -86,38 +283,33 @@ class GPIOController(QObject):
         print(f"Выполняется действие: {action_name}...")
         
         try:
-            # 1. Проигрывание звука (если mpg123 установлен и файл существует)
-            # Убедитесь, что mpg123 установлен: sudo apt-get install mpg123
-            # И что путь к файлу /home/pi/Music/Gong.mp3 корректен.
-            # os.system() является блокирующим вызовом. Для длительных звуков лучше использовать subprocess.
-            # Для короткого звука это может быть приемлемо, но в async-методе лучше избегать.
-            # Заменим на asyncio.create_subprocess_shell для неблокирующего выполнения.
-            process_sound = await asyncio.create_subprocess_shell('mpg123 /home/pi/Music/Gong.mp3')
-            await process_sound.wait() # Дождемся завершения проигрывания звука
-            
+            # Звук, уведомление и завершение chromium не зависят друг от друга, поэтому запускаются
+            # одновременно: общее время действия равно самому долгому шагу, а не их сумме.
+            # create_subprocess_exec запускает программы напрямую, без промежуточного /bin/sh.
+            # 1. Завершение самого старого процесса chromium (аналог 'pkill -o chromium') напрямую через
+            #    /proc и os.kill, без запуска отдельного процесса.
             # 2. Системное уведомление (если libnotify-bin установлен)
-            # os.system('notify-send "Chromium Закрыт" "Браузер был принудительно завершен." --icon=dialog-information')
-            process_notify = await asyncio.create_subprocess_shell(
-                'notify-send "Chromium Закрыт" "Браузер был принудительно завершен." --icon=dialog-information'
-            )
-            await process_notify.wait()
-
-            # 3. Завершение процесса chromium
-            # -o означает "самый старый" из найденных процессов.
-            # pkill возвращает 0 при успехе (хотя бы один процесс убит), 1 если процесс не найден.
-            process_pkill = await asyncio.create_subprocess_shell('pkill -o chromium')
-            return_code = await process_pkill.wait() 
+            # 3. Проигрывание звука (если mpg123 установлен и файл GONG_PATH существует): команда
+            #    постоянному процессу mpg123; отдельный процесс запускается, только если он недоступен.
+            steps = [
+                self._loop.run_in_executor(None, _kill_oldest, 'chromium'),
+                self._run_command(self._notify_send_path, 'notify-send',
+                                  'Chromium Закрыт', 'Браузер был принудительно завершен.', '--icon=dialog-information'),
+            ]
+            if not self._play_gong():
+                steps.append(self._run_command(self._mpg123_path, 'mpg123', self.GONG_PATH))
+            chromium_killed, *_ = await asyncio.gather(*steps)
             
-            if return_code == 0:
+            if chromium_killed:
                 print("Процесс chromium успешно завершен.")
             else:
-                print(f"Команда 'pkill -o chromium' завершилась с кодом {return_code}. Возможно, процесс chromium не был найден.")
+                print("Процесс chromium не найден.")
 
             # 4. Пауза (если необходима)
             await asyncio.sleep(1) # Уменьшил паузу с 5 до 1 секунды
             
             message = f"Действие '{action_name}' выполнено."
-            if return_code != 0 :
+            if not chromium_killed:
                  message += " (Chromium не найден)"
             print(message)
             self.shutdown_action_finished.emit(message) # Отправляем сигнал в MainWindow
@@ -126,40 +318,74 @@ class GPIOController(QObject):
             error_message = f"Ошибка при выполнении действия '{action_name}': {e}"
             print(error_message)
             self.shutdown_action_finished.emit(error_message) # Отправляем сообщение об ошибке
+        finally:
+            self._action_in_progress = False # Следующее нажатие снова запустит действие
 
     # --- Остальные методы-заглушки для GPIO ---
     # control_gpio_1 был удален, так как GPIO17 теперь используется для shutdown_button
 
-    async def control_gpio_2(self):
-        """Асинхронная заглушка для управления вторым GPIO-каналом/устройством."""
-        print("Действие для GPIO 2 (заглушка): выполнено.")
-        await asyncio.sleep(0.1)
+    async def control_many(self, mask):
+        """
+        Асинхронная заглушка для одновременного управления несколькими GPIO-каналами.
+        Бит i маски соответствует каналу CONTROL_CHANNELS[i]. Состояния всех каналов
+        формируются одним кортежем, чтобы при подключении реальных пинов (gpiozero.LEDBoard)
+        они записывались одной операцией (board.value = states), а не отдельно на каждый пин.
+        Args:
+            mask (int): Битовая маска каналов, которые нужно активировать.
+        """
+        # Без искусственной задержки: переключение реального пина (gpiozero) выполняется мгновенно,
+        # а пауза лишь задерживала бы обработку нажатия. Антидребезг, если понадобится,
+        # лучше делать проверкой времени последнего переключения, а не ожиданием.
+        states = tuple(bool(mask & (1 << i)) for i in range(len(self.CONTROL_CHANNELS)))
+        active = [str(channel) for channel, state in zip(self.CONTROL_CHANNELS, states) if state]
+        print(f"Действие для GPIO {', '.join(active)} (заглушка): выполнено.")
         # Пример, если бы этот метод тоже отправлял сигнал:
-        # self.shutdown_action_finished.emit("Заглушка GPIO 2 выполнена") 
+        # self.shutdown_action_finished.emit(f"Заглушка GPIO {', '.join(active)} выполнена")
 
-    async def control_gpio_3(self):
-        """Асинхронная заглушка для управления третьим GPIO-каналом/устройством."""
-        print("Действие для GPIO 3 (заглушка): выполнено.")
-        await asyncio.sleep(0.1)
+    async def control(self, channel):
+        """
+        Асинхронная заглушка для управления одним GPIO-каналом/устройством.
+        Реализована через control_many с маской из одного бита.
+        Args:
+            channel (int): Номер канала из CONTROL_CHANNELS (2-4, соответствует кнопкам в GUI).
+        """
+        await self.control_many(1 << self.CONTROL_CHANNELS.index(channel))
 
-    async def control_gpio_4(self):
-        """Асинхронная заглушка для управления четвертым GPIO-каналом/устройством."""
-        print("Действие для GPIO 4 (заглушка): выполнено.")
-        await asyncio.sleep(0.1)
+    # Совместимость с прежними именами методов control_gpio_N()
+    control_gpio_2 = functools.partialmethod(control, 2)
+    control_gpio_3 = functools.partialmethod(control, 3)
+    control_gpio_4 = functools.partialmethod(control, 4)
 
     def close(self):
         """
         Корректно освобождает ресурсы GPIO, используемые этим контроллером.
         Вызывается при закрытии приложения.
         """
-        if hasattr(self, 'shutdown_button') and self.shutdown_button:
+        if self._button_request:
+            try:
+                self._loop.remove_reader(self._button_request.fd)
+                self._button_request.release()
+                print("GPIOController: Линия GPIO17 (gpiod) успешно освобождена.")
+            except Exception as e:
+                print(f"GPIOController: Ошибка при освобождении линии GPIO17 (gpiod): {e}")
+            self._button_request = None
+
+        if self.shutdown_button is not None: # Атрибут всегда задан в __init__ (None, если кнопка не инициализирована)
             try:
                 self.shutdown_button.close()
                 print("GPIOController: Кнопка Shutdown (GPIO17) успешно освобождена.")
             except Exception as e:
                 print(f"GPIOController: Ошибка при освобождении кнопки Shutdown (GPIO17): {e}")
+            self.shutdown_button = None
         
+        if self._player and self._player.poll() is None:
+            try:
+                self._player.stdin.write(b'QUIT\n')
+                self._player.stdin.close()
+                self._player.wait(timeout=1)
+            except (OSError, subprocess.TimeoutExpired):
+                self._player.kill()
+            self._player = None
+
         # ... (закрытие других GPIO объектов, если они были инициализированы) ...
         print("GPIOController: Ресурсы освобождены.")
-
-```
@@ -4,15 +4,17 @@
 # отправляет сигналы для обновления GUI.
 
 import asyncio
+import time
 from PyQt5.QtCore import QObject, pyqtSignal # PySide6 -> PyQt5, Signal -> pyqtSignal
 from gpiozero import LED, PingServer
-from gpiozero.tools import negated # Утилита для инвертирования значения источника gpiozero
 
 class NetworkChecker(QObject):
     """
     Класс NetworkChecker использует gpiozero.PingServer для мониторинга доступности сети (8.8.8.8).
-    Автоматически управляет зеленым и красным светодиодами для индикации статуса.
-    Периодически проверяет статус и отправляет сигнал network_status_gui для обновления UI.
+    Управляет зеленым и красным светодиодами для индикации статуса.
+    Светодиоды переключаются и сигнал network_status_gui для обновления UI отправляется
+    только при изменении статуса (события when_activated/when_deactivated PingServer),
+    без периодического опроса.
     """
     # Сигнал для обновления GUI: True/False (доступен/нет), строка сообщения
     network_status_gui = pyqtSignal(bool, str) # Signal -> pyqtSignal
@@ -25,6 +27,15 @@ class NetworkChecker(QObject):
             parent (QObject, optional): Родительский объект PyQt.
         """
         super().__init__(parent)
+        self._loop = None # Цикл событий asyncio, в который передаются события PingServer из потока gpiozero
+        # Интервал в секундах между проверками PING, которые PingServer выполняет в своем фоновом потоке.
+        self.check_interval = 10
+        # Минимальный интервал в секундах между сигналами network_status_gui: при "мигании" сети
+        # промежуточные состояния не отправляются, GUI получает только последний статус.
+        self.min_emit_interval = 1.0
+        self._last_emit_ts = 0.0 # time.monotonic() последней отправки сигнала
+        self._pending_status = None # Последний статус, ожидающий отправки в GUI
+        self._pending_emit = None # asyncio.TimerHandle отложенной отправки (_flush_status)
         
         # PIN-коды для светодиодов (BCM нумерация GPIO).
         # Убедитесь, что эти пины не используются другими компонентами или службами ОС.
@@ -35,26 +46,22 @@ class NetworkChecker(QObject):
             self.red_led = LED(26)
             
             # PingServer для проверки доступности хоста (по умолчанию 8.8.8.8 - DNS Google).
-            self.ping_server = PingServer('8.8.8.8')
-
-            # Настройка автоматического управления светодиодами на основе состояния PingServer.
-            # source_delay: интервал (в секундах), с которым PingServer будет выполнять проверку PING.
-            self.ping_server.source_delay = 10 
-            # self.green_led.source: привязывает состояние светодиода к значению PingServer.
-            # Зеленый светодиод будет гореть, когда self.ping_server.value (результат пинга) True.
-            self.green_led.source = self.ping_server.values 
-            # Красный светодиод будет гореть, когда self.ping_server.value False.
-            # negated() инвертирует значение, так как красный LED должен гореть при отсутствии сети.
-            self.red_led.source = negated(self.ping_server.values)
-
-            # Начальное определение статуса сети на основе текущего значения PingServer.
-            self.is_network_available = self.ping_server.value 
-            self.running = False # Флаг для управления циклом _monitor_loop, который обновляет GUI.
-            # Интервал в секундах для _monitor_loop, как часто проверять self.ping_server.value для обновления GUI.
-            # Это может быть чаще, чем source_delay, чтобы GUI реагировал быстрее на уже определенное изменение.
-            self.gui_check_interval = 1 
-
-            print(f"NetworkChecker инициализирован. Зеленый LED: GPIO21, Красный LED: GPIO26. Начальный статус сети (gpiozero): {'Доступен' if self.is_network_available else 'Отсутствует'}")
+            # event_delay: интервал (в секундах), с которым PingServer выполняет проверку PING
+            # для генерации событий. Это единственный источник пингов: светодиоды не привязываются
+            # через .source (каждое чтение .value запускает отдельный ping), а переключаются по событиям.
+            self.ping_server = PingServer('8.8.8.8', event_delay=self.check_interval)
+
+            # Начальный статус определяется в start_monitoring: чтение ping_server.value выполняет
+            # блокирующий ping, поэтому оно делается в отдельном потоке, а не при создании окна.
+            self.is_network_available = False # Статус, последним отправленный в GUI
+            self._ping_state = None # Последний статус от PingServer (None - еще не определен), обновляется колбэками
+
+            # События смены состояния PingServer (вызываются в фоновом потоке gpiozero).
+            self.ping_server.when_activated = lambda: self._on_ping_state(True)
+            self.ping_server.when_deactivated = lambda: self._on_ping_state(False)
+            self.running = False # Флаг активности мониторинга для GUI (обработки событий PingServer).
+
+            print("NetworkChecker инициализирован. Зеленый LED: GPIO21, Красный LED: GPIO26.")
 
         except Exception as e:
             # Обработка возможных исключений при инициализации gpiozero (например, если библиотека не установлена или запущено не на RPi)
@@ -67,6 +74,7 @@ class NetworkChecker(QObject):
             self.red_led = None
             self.ping_server = None
             self.is_network_available = False # Предполагаем худший случай
+            self._ping_state = False
             self.running = False
             # Можно было бы создать "пустые" объекты LED и PingServer, если бы gpiozero это поддерживала легко для заглушек.
             # Вместо этого просто проверяем на None в других методах.
@@ -74,8 +82,9 @@ class NetworkChecker(QObject):
 
     def start_monitoring(self):
         """
-        Запускает асинхронный цикл _monitor_loop для периодической проверки статуса PingServer
-        и отправки сигналов в GUI.
+        Запускает мониторинг статуса сети для GUI: события PingServer (when_activated/when_deactivated),
+        которые gpiozero вызывает только при смене состояния, начинают передаваться в GUI.
+        Текущий статус отправляется в GUI сразу.
         """
         if not self.ping_server: # Если gpiozero не инициализировался
             print("NetworkChecker: gpiozero компоненты не инициализированы. Мониторинг для GUI не запущен.")
@@ -83,74 +92,115 @@ class NetworkChecker(QObject):
 
         if not self.running:
             self.running = True
-            # Создание задачи asyncio для фонового выполнения _monitor_loop
-            asyncio.create_task(self._monitor_loop())
-            print("Мониторинг сети для GUI (на основе gpiozero.PingServer) запущен.")
+            self._loop = asyncio.get_event_loop()
+
+            # Начальный статус отправляется в GUI из отдельной задачи (а не синхронно),
+            # чтобы вызывающий код успел завершить построение интерфейса.
+            # Это гарантирует, что GUI получит статус, даже если он не изменится в будущем.
+            self._loop.create_task(self._emit_initial_status())
+            print("Мониторинг сети для GUI (на основе событий gpiozero.PingServer) запущен.")
 
     def stop_monitoring(self):
         """
-        Останавливает цикл _monitor_loop и освобождает ресурсы gpiozero.
+        Останавливает мониторинг сети для GUI и освобождает ресурсы gpiozero.
         """
-        self.running = False # Сигнал для остановки цикла _monitor_loop
+        self.running = False # События PingServer, уже поставленные в очередь цикла, будут проигнорированы
+        if self._pending_emit:
+            self._pending_emit.cancel()
+            self._pending_emit = None
         
         if not self.ping_server: # Если gpiozero не инициализировался
             print("NetworkChecker: gpiozero компоненты не инициализированы. Остановка не требуется.")
             return
 
-        # Отключаем source перед закрытием, чтобы остановить внутренние активности gpiozero,
-        # связанные с обновлением состояния светодиодов.
-        if self.green_led and hasattr(self.green_led, 'source'):
-             self.green_led.source = None
-        if self.red_led and hasattr(self.red_led, 'source'):
-             self.red_led.source = None
+        # Отписываемся от событий PingServer перед закрытием, чтобы gpiozero остановил
+        # фоновый поток отслеживания событий и не переключал уже закрытые светодиоды.
+        self.ping_server.when_activated = None
+        self.ping_server.when_deactivated = None
         
         # Закрываем GPIO устройства. Метод close() освобождает GPIO пины.
-        if self.green_led:
-            self.green_led.close()
-        if self.red_led:
-            self.red_led.close()
-        if self.ping_server:
-            self.ping_server.close()
+        for device in (self.green_led, self.red_led, self.ping_server):
+            if device is not None:
+                device.close()
             
         print("Мониторинг сети остановлен, ресурсы gpiozero освобождены.")
 
-    async def _monitor_loop(self):
+    def _set_leds(self, is_available):
+        """Зажигает зеленый светодиод при доступной сети и красный при ее отсутствии."""
+        if self.green_led:
+            self.green_led.value = is_available
+        if self.red_led:
+            self.red_led.value = not is_available
+
+    def _on_ping_state(self, state):
         """
-        Асинхронный цикл, который периодически проверяет значение self.ping_server.value
-        и, если оно изменилось, отправляет сигнал network_status_gui для обновления интерфейса.
+        Колбэк событий PingServer, выполняется во внутреннем потоке gpiozero.
+        Сразу переключает светодиоды, а обновление GUI передает в поток цикла событий
+        через call_soon_threadsafe (Qt-сигналы и состояние для GUI обрабатываются только там).
         """
-        if not self.ping_server: # Дополнительная проверка
-            print("NetworkChecker: _monitor_loop не может быть запущен, PingServer не инициализирован.")
-            self.running = False
+        self._ping_state = state
+        self._set_leds(state)
+        if self.running and self._loop:
+            self._loop.call_soon_threadsafe(self._emit_status, state)
+
+    async def _emit_initial_status(self):
+        """
+        Отправляет в GUI текущий (начальный) статус сети. Если колбэки PingServer еще не сообщили
+        статус, он однократно читается из ping_server.value в пуле потоков цикла (run_in_executor),
+        чтобы блокирующий ping не останавливал цикл событий.
+        """
+        if self._ping_state is None:
+            try:
+                state = await self._loop.run_in_executor(None, lambda: self.ping_server.value)
+            except Exception as e: # PingServer мог быть закрыт в stop_monitoring во время проверки
+                print(f"NetworkChecker: Не удалось определить начальный статус сети: {e}")
+                return
+            if not self.running:
+                return
+            if self._ping_state is None: # Событие PingServer могло прийти раньше
+                self._ping_state = state
+                self._set_leds(state)
+        if not self.running:
             return
-            
-        print("Цикл мониторинга GUI для статуса сети (gpiozero) запущен...")
-        
-        # Отправляем начальный статус в GUI немедленно при запуске цикла
-        # Это гарантирует, что GUI получит статус, даже если он не изменится в будущем.
+        self.is_network_available = self._ping_state
         initial_message = "Интернет (gpiozero): доступен" if self.is_network_available else "Интернет (gpiozero): отсутствует"
+        self._last_emit_ts = time.monotonic()
         self.network_status_gui.emit(self.is_network_available, initial_message)
 
-        while self.running:
-            # Ожидание указанного интервала перед следующей проверкой
-            await asyncio.sleep(self.gui_check_interval)
-            
-            # Если за время ожидания флаг running был изменен на False (например, вызовом stop_monitoring),
-            # прерываем цикл.
-            if not self.running:
-                break
+    def _emit_status(self, current_status):
+        """
+        Выполняется в потоке цикла событий при смене состояния PingServer.
+        Если с последней отправки прошло меньше min_emit_interval, отправка откладывается
+        до конца интервала; за это время более новые события лишь заменяют ожидающий статус.
+        Args:
+            current_status (bool): True, если пинг успешен (сеть доступна), иначе False.
+        """
+        if not self.running:
+            return
 
-            # Получаем текущее значение от PingServer (True если пинг успешен, False если нет)
-            current_status = self.ping_server.value
-            
-            # Если текущий статус отличается от ранее сохраненного, значит, произошло изменение.
-            if current_status != self.is_network_available:
-                self.is_network_available = current_status # Обновляем сохраненный статус
-                message = "Интернет (gpiozero): доступен" if current_status else "Интернет (gpiozero): отсутствует"
-                print(f"Статус сети изменился (для GUI, gpiozero): {message}")
-                # Отправляем сигнал для обновления GUI
-                self.network_status_gui.emit(current_status, message)
-        
-        print("Цикл мониторинга GUI для статуса сети (gpiozero) остановлен.")
+        self._pending_status = current_status
+        if self._pending_emit: # Отправка уже запланирована и возьмет последний статус
+            return
+        delay = self._last_emit_ts + self.min_emit_interval - time.monotonic()
+        if delay > 0:
+            self._pending_emit = self._loop.call_later(delay, self._flush_status)
+        else:
+            self._flush_status()
 
-```
+    def _flush_status(self):
+        """
+        Отправляет сигнал network_status_gui с последним статусом, если он отличается от ранее отправленного.
+        """
+        self._pending_emit = None
+        if not self.running:
+            return
+        current_status = self._pending_status
+
+        # Если текущий статус отличается от ранее сохраненного, значит, произошло изменение.
+        if current_status != self.is_network_available:
+            self.is_network_available = current_status # Обновляем сохраненный статус
+            message = "Интернет (gpiozero): доступен" if current_status else "Интернет (gpiozero): отсутствует"
+            print(f"Статус сети изменился (для GUI, gpiozero): {message}")
+            self._last_emit_ts = time.monotonic()
+            # Отправляем сигнал для обновления GUI
+            self.network_status_gui.emit(current_status, message)
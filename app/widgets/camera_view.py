@@ -0,0 +1,95 @@
+# app/widgets/camera_view.py
+# Виджет для отображения видеопотока с камеры.
+# Рисует кадры напрямую через QPainter, без промежуточного QPixmap и без масштабирования при отрисовке.
+
+from PyQt5.QtWidgets import QWidget, QSizePolicy, QStyle, QStyleOption # PySide6 -> PyQt5
+from PyQt5.QtCore import Qt, QSize, QRect, pyqtSignal # PySide6 -> PyQt5, Signal -> pyqtSignal
+from PyQt5.QtGui import QImage, QPainter # PySide6 -> PyQt5
+
+class CameraView(QWidget):
+    """
+    Виджет CameraView отображает кадры, полученные от CameraHandler.
+    Кадр (numpy-массив BGRA или оттенки серого) оборачивается в QImage без копирования
+    и в paintEvent выводится в backing store одной операцией drawImage: формат RGB32 совпадает
+    с форматом окна, поэтому это прямое копирование строк без конвертации (в отличие от
+    QLabel.setPixmap(QPixmap.fromImage(...)), который создает копию кадра в QPixmap).
+    Кадры должны приходить уже масштабированными: размер области рисования сообщается
+    сигналом display_size_changed.
+    """
+    # Сигнал с новым размером области рисования (для CameraHandler.set_display_size)
+    display_size_changed = pyqtSignal(QSize) # Signal -> pyqtSignal
+
+    def __init__(self, placeholder_text="", parent=None):
+        """
+        Args:
+            placeholder_text (str): Текст, отображаемый, пока не получен первый кадр.
+            parent (QWidget, optional): Родительский виджет.
+        """
+        super().__init__(parent)
+        self.placeholder_text = placeholder_text
+        self._frame = None # Текущий кадр (numpy): QImage не владеет его данными, поэтому держим ссылку
+        self._image = None # QImage поверх данных self._frame
+        self._image_rect = QRect() # Область виджета, занятая кадром
+        # Формат QImage для кадров выбирается один раз (set_grayscale), а не определяется по каждому кадру
+        self._image_format = QImage.Format_RGB32
+        # Размер виджета задает сетка, а не размер кадра.
+        self.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)
+
+    def set_grayscale(self, grayscale):
+        """
+        Задает формат входящих кадров по настройке CameraHandler.grayscale.
+        Args:
+            grayscale (bool): True - кадры (H, W) в оттенках серого, False - (H, W, 4) BGRA.
+        """
+        self._image_format = QImage.Format_Grayscale8 if grayscale else QImage.Format_RGB32
+
+    def set_frame(self, frame):
+        """
+        Устанавливает новый кадр и планирует перерисовку.
+        Args:
+            frame (numpy.ndarray): Непрерывный массив uint8 (H, W, 4) BGRA или (H, W) в оттенках серого
+                (формат задается set_grayscale).
+        """
+        h, w = frame.shape[:2]
+        self._frame = frame
+        self._image = QImage(frame.data, w, h, frame.strides[0], self._image_format)
+        image_rect = self._centered_rect(w, h)
+        if image_rect == self._image_rect:
+            # Кадр того же размера: перерисовывается только его область, без фона и углов вокруг
+            self.update(image_rect)
+        else:
+            self._image_rect = image_rect
+            self.update()
+
+    def _centered_rect(self, w, h):
+        """Возвращает прямоугольник w x h по центру области содержимого виджета."""
+        rect = self.contentsRect()
+        return QRect(rect.x() + (rect.width() - w) // 2, rect.y() + (rect.height() - h) // 2, w, h)
+
+    def paintEvent(self, event):
+        """Рисует фон виджета по стилю QSS и текущий кадр по центру (или текст-заглушку)."""
+        painter = QPainter(self)
+        if self._image is not None and self._image_rect.contains(event.rect()):
+            # Обычный случай при потоке кадров: кадр полностью закрывает перерисовываемую область,
+            # поэтому стиль виджета (PE_Widget) под ним не рисуется. Фон родителя в этой области Qt
+            # по-прежнему заливает сам: WA_OpaquePaintEvent не ставится, так как скругленные углы
+            # из QSS (border-radius) при полной перерисовке должны показывать фон родителя.
+            painter.drawImage(self._image_rect.topLeft(), self._image)
+            return
+
+        # Для подклассов QWidget фон и скругление из QSS рисуются только явным вызовом PE_Widget.
+        option = QStyleOption()
+        option.initFrom(self)
+        self.style().drawPrimitive(QStyle.PE_Widget, option, painter, self)
+
+        if self._image is None:
+            painter.drawText(self.contentsRect(), Qt.AlignCenter, self.placeholder_text)
+            return
+        painter.drawImage(self._image_rect.topLeft(), self._image)
+
+    def resizeEvent(self, event):
+        """Сообщает о новом размере области рисования, чтобы следующие кадры масштабировались под нее."""
+        super().resizeEvent(event)
+        if self._image is not None:
+            self._image_rect = self._centered_rect(self._image.width(), self._image.height())
+        self.display_size_changed.emit(self.contentsRect().size())
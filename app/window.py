@@ -2,16 +2,134 @@
 # Основной файл для главного окна приложения PyQt.
 # Отвечает за компоновку UI, инициализацию логических модулей и обработку событий.
 
-from PyQt5.QtWidgets import QMainWindow, QWidget, QGridLayout, QLabel, QPushButton, QVBoxLayout # PySide6 -> PyQt5
-from PyQt5.QtCore import Qt, QUrl, QTimer, QPoint # PySide6 -> PyQt5
-from PyQt5.QtGui import QPixmap # PySide6 -> PyQt5
-from PyQt5.QtWebEngineWidgets import QWebEngineView # PySide6 -> PyQt5
+from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QGridLayout, QLabel, QPushButton, QVBoxLayout, QSizePolicy, QStackedLayout # PySide6 -> PyQt5
+from PyQt5.QtCore import Qt, QUrl, QTimer, QPoint, QLoggingCategory, pyqtSlot # PySide6 -> PyQt5, Slot -> pyqtSlot
+from PyQt5.QtGui import QFont # PySide6 -> PyQt5
+from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEnginePage, QWebEngineProfile, QWebEngineSettings # PySide6 -> PyQt5
 
 # Импорт логических модулей
 from app.logic.camera_handler import CameraHandler
 from app.logic.network_checker import NetworkChecker
 from app.logic.gpio_controller import GPIOController
+from app.widgets.camera_view import CameraView
 import asyncio # Для управления асинхронными задачами (например, GPIO)
+import functools # partial для подключения кнопок GPIO к одному слоту
+
+# Категория журнала GUI. Отладочные сообщения по умолчанию выключены (см. main.py),
+# их можно включить без изменения кода: QT_LOGGING_RULES="kiosk.gui.debug=true".
+# QLoggingCategory хранит указатель на имя без копирования, поэтому имя держится
+# в модульной переменной bytes, а не передается временной строкой.
+_LOG_NAME = b"kiosk.gui"
+_log = QLoggingCategory(_LOG_NAME)
+
+def _debug(message):
+    """Выводит отладочное сообщение GUI, только если включена категория kiosk.gui.debug."""
+    if _log.isDebugEnabled():
+        print(message)
+
+def _warning(message):
+    """Выводит предупреждение GUI (категория kiosk.gui.warning включена по умолчанию)."""
+    if _log.isWarningEnabled():
+        print(message)
+
+# HTML-код виджета погоды (предоставлен сторонним сервисом) и адрес, относительно которого он загружается
+WEATHER_WIDGET_HTML = '<div id="ww_80462c5023641" v="1.3" loc="id" a=\'{"t":"responsive","lang":"ru","ids":["wl3996"],"font":"Arial","sl_ics":"one_a","sl_sot":"celsius","cl_bkg":"image","cl_font":"#FFFFFF","cl_cloud":"#FFFFFF","cl_persp":"#81D4FA","cl_sun":"#FFC107","cl_moon":"#FFC107","cl_thund":"#FF5722"}\'><a href="https://weatherwidget.org/" id="ww_80462c5023641_u" target="_blank">Free weather widget</a></div><script async src="https://app3.weatherwidget.org/js/?id=ww_80462c5023641"></script>'
+WEATHER_WIDGET_BASE_URL = "https://app3.weatherwidget.org/"
+# Виджет погоды отображается как статический снимок: страница загружается, через WEATHER_RENDER_DELAY_MS
+# после загрузки (скрипт виджета дорисовывает данные асинхронно) снимается в QPixmap, а QWebEngineView
+# удаляется вместе с процессом рендеринга Chromium. Снимок обновляется раз в WEATHER_REFRESH_INTERVAL_MS.
+WEATHER_RENDER_DELAY_MS = 5000
+# Имя постоянного профиля QtWebEngine для виджета погоды: кэш HTTP и локальное хранилище
+# сохраняются на диске между обновлениями снимка и перезапусками приложения.
+WEATHER_PROFILE_NAME = "kiosk"
+WEATHER_REFRESH_INTERVAL_MS = 30 * 60 * 1000
+# Задержка первой загрузки виджета погоды после показа окна (см. конец MainWindow.__init__)
+WEATHER_INITIAL_LOAD_DELAY_MS = 1000
+
+# Тексты, отображаемые до получения первых данных
+CAMERA_PLACEHOLDER_TEXT = "Ожидание видео..."
+NETWORK_STATUS_PLACEHOLDER_TEXT = "Статус сети: ожидание..."
+
+# Шрифт приложения (DejaVu Sans как хороший вариант для Linux), устанавливается на QApplication.
+# Правила QSS задают только размер шрифта, семейство наследуется от шрифта приложения.
+APP_FONT_FAMILY = "DejaVu Sans"
+
+# Единая таблица стилей приложения. Устанавливается один раз на QApplication и разбирается
+# движком QSS один раз, а не отдельно для каждого виджета; правила привязаны к objectName виджетов.
+APP_STYLESHEET = '''
+/* Общий фон окна */
+#mainWindow {
+    background-color: #e0e0e0;
+}
+
+/* Информер погоды: скругление углов */
+#weatherView {
+    border-radius: 10px;
+}
+
+/* Область отображения камеры: черный фон, скругленные углы, белый текст */
+#cameraView {
+    background-color: black;
+    border-radius: 10px; 
+    color: white; 
+}
+
+/* Неоморфический стиль для информационной панели */
+#infoPanel3 {
+    background-color: #e0e0e0; /* Основной цвет фона, как у окна */
+    border-radius: 15px; /* Скругление углов */
+    border-width: 2px; /* Ширина границы */
+    border-style: solid; /* Стиль границы */
+    /* Цвета границ для эффекта "вдавленности/выпуклости" (сверху-слева светлее, снизу-справа темнее) */
+    border-color: #c0c0c0 #f0f0f0 #f0f0f0 #c0c0c0; /* top right bottom left */
+}
+
+/* Метка статуса сети */
+#networkStatusLabel {
+    color: #424242;
+    font-size: 15px;
+}
+/* Цвет статуса переключается динамическим свойством state (см. update_network_status_label) */
+#networkStatusLabel[state="ok"] {
+    color: #2E7D32; /* темно-зеленый */
+}
+#networkStatusLabel[state="bad"] {
+    color: #C62828; /* темно-красный */
+}
+
+/* Контейнер для кнопок GPIO: фон и скругление */
+#gpioContainer {
+    background-color: #e0e0e0;
+    border-radius: 10px;
+}
+
+/* Общий неоморфический стиль для кнопок GPIO */
+#gpioContainer QPushButton {
+    background-color: #e0e0e0; /* Фон кнопки */
+    color: #444; /* Цвет текста */
+    border-width: 2px; /* Ширина границы */
+    border-style: solid; /* Стиль границы */
+    /* Цвета границ для неоморфического эффекта (выпуклость) */
+    border-color: #f0f0f0 #c0c0c0 #c0c0c0 #f0f0f0; /* top right bottom left */
+    border-radius: 15px; /* Скругление углов */
+    padding: 15px; /* Внутренние отступы */
+    font-size: 14px; /* Размер шрифта */
+}
+#gpioContainer QPushButton:pressed { /* Стиль для нажатой кнопки */
+    background-color: #d5d5d5; /* Слегка затемненный фон */
+    /* Инвертированные цвета границ для эффекта "вдавленности" */
+    border-color: #c0c0c0 #f0f0f0 #f0f0f0 #c0c0c0; 
+}
+
+/* Всплывающее сообщение (toast) */
+#toastLabel {
+    background-color: rgba(0, 0, 0, 180); /* Полупрозрачный черный фон */
+    color: white; /* Белый текст */
+    padding: 10px; /* Внутренние отступы */
+    border-radius: 8px; /* Скругленные углы */
+    font-size: 14px;
+}
+'''
 
 class MainWindow(QMainWindow):
     """
@@ -28,60 +146,92 @@ class MainWindow(QMainWindow):
         # - WindowStaysOnTopHint: старается держать окно поверх других (полезно для киосков).
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint) # Qt.WindowType.Flag -> Qt.Flag
         
-        # 1. Общий фон окна и базовые стили
+        # 1. Общий фон окна и базовые стили (все стили виджетов - в APP_STYLESHEET)
+        # Шрифт подбирается (fontconfig) один раз для всего приложения, а не при разборе каждого
+        # правила font-family; при отсутствии DejaVu Sans используется системный шрифт без засечек.
+        # Меняется только семейство шрифта приложения: размер и остальные параметры сохраняются
+        # (QFont(family) без размера сбросил бы pointSize в -1).
+        app_font = QApplication.font()
+        app_font.setFamily(APP_FONT_FAMILY)
+        app_font.setStyleHint(QFont.SansSerif)
+        QApplication.setFont(app_font)
+        QApplication.instance().setStyleSheet(APP_STYLESHEET)
         self.setObjectName("mainWindow") # Имя объекта для применения стилей
-        self.setStyleSheet("#mainWindow { background-color: #e0e0e0; }") # Базовый цвет фона
         
+        # Цикл событий asyncio (quamash), через который слоты окна планируют задачи
+        self._loop = asyncio.get_event_loop()
+
         # Центральный виджет, который будет содержать все остальные элементы
         central_widget = QWidget(self)
         self.setCentralWidget(central_widget)
+
+        # Всплывающее сообщение (toast): одна метка и один таймер на все сообщения, создаются один раз.
+        # Метка создана после центрального виджета, поэтому отображается поверх него.
+        self.toast_label = QLabel(self) # `self` (MainWindow) как родитель
+        self.toast_label.setObjectName("toastLabel") # Стиль - правило #toastLabel в APP_STYLESHEET
+        self.toast_label.hide()
+        self.toast_timer = QTimer(self)
+        self.toast_timer.setSingleShot(True) # Таймер сработает один раз
+        self.toast_timer.timeout.connect(self.toast_label.hide) # Скрытие сообщения по таймауту
+        # Размер окна для позиционирования toast; обновляется в resizeEvent (в киоске - один раз при showFullScreen).
+        self._window_width, self._window_height = self.width(), self.height()
         
         # Основной менеджер компоновки - сетка (2x2)
         layout = QGridLayout(central_widget)
         layout.setSpacing(10) # Расстояние между ячейками сетки
         layout.setContentsMargins(10, 10, 10, 10) # Отступы от краев окна до сетки
+        # Четыре равные части экрана: размеры ячеек задаются коэффициентами растяжения,
+        # а не подбором по sizeHint содержимого (у QWebEngineView он зависит от загруженной страницы).
+        for index in range(2):
+            layout.setRowStretch(index, 1)
+            layout.setColumnStretch(index, 1)
 
         # --- Первая часть экрана (0,0): Информер погоды ---
-        self.weather_widget_view = QWebEngineView() # Виджет для отображения веб-страниц
-        self.weather_widget_view.setObjectName("weatherView")
-        self.weather_widget_view.setStyleSheet("#weatherView { border-radius: 10px; }") # Скругление углов
-        # HTML-код виджета погоды (предоставлен сторонним сервисом)
-        html_content = '<div id="ww_80462c5023641" v="1.3" loc="id" a=\'{"t":"responsive","lang":"ru","ids":["wl3996"],"font":"Arial","sl_ics":"one_a","sl_sot":"celsius","cl_bkg":"image","cl_font":"#FFFFFF","cl_cloud":"#FFFFFF","cl_persp":"#81D4FA","cl_sun":"#FFC107","cl_moon":"#FFC107","cl_thund":"#FF5722"}\'><a href="https://weatherwidget.org/" id="ww_80462c5023641_u" target="_blank">Free weather widget</a></div><script async src="https://app3.weatherwidget.org/js/?id=ww_80462c5023641"></script>'
-        self.weather_widget_view.setHtml(html_content, baseUrl=QUrl("https://app3.weatherwidget.org/")) # Загрузка HTML
-        layout.addWidget(self.weather_widget_view, 0, 0) # Добавление в сетку
+        # Контейнер содержит QLabel со снимком и (только на время загрузки) QWebEngineView.
+        # StackAll: оба виджета видимы, текущий - сверху. Обновляемая страница отрисовывается под
+        # прежним снимком и не видна, пока _snapshot_weather_widget не заменит снимок новым.
+        self.weather_container = QWidget()
+        self.weather_container.setObjectName("weatherView")
+        self.weather_container.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored) # Размер задает сетка
+        self.weather_layout = QStackedLayout(self.weather_container)
+        self.weather_layout.setStackingMode(QStackedLayout.StackAll) # QStackedLayout.StackingMode.StackAll -> StackAll
+        self.weather_snapshot_label = QLabel() # Статический снимок виджета погоды
+        self.weather_snapshot_label.setAlignment(Qt.AlignCenter) # Qt.AlignmentFlag.AlignCenter -> Qt.AlignCenter
+        self.weather_snapshot_label.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)
+        self.weather_layout.addWidget(self.weather_snapshot_label)
+        self.weather_widget_view = None # QWebEngineView, существует только во время загрузки снимка
+        self.weather_profile = None # Профиль QtWebEngine, создается при первой загрузке (_get_weather_profile)
+        # Содержимое загружается в _load_weather_widget после первого показа окна (см. конец __init__)
+        # и затем периодически обновляется по таймеру.
+        self.weather_refresh_timer = QTimer(self)
+        self.weather_refresh_timer.setInterval(WEATHER_REFRESH_INTERVAL_MS)
+        self.weather_refresh_timer.timeout.connect(self._load_weather_widget)
+        layout.addWidget(self.weather_container, 0, 0) # Добавление в сетку
 
         # --- Вторая часть экрана (0,1): Вид с камеры ---
-        self.camera_view_label = QLabel("Ожидание видео...") # Метка для отображения кадров с камеры
-        self.camera_view_label.setAlignment(Qt.AlignCenter) # Qt.AlignmentFlag.AlignCenter -> Qt.AlignCenter
-        self.camera_view_label.setAutoFillBackground(False) # Отключаем автозаливку, т.к. используем стили
-        self.camera_view_label.setObjectName("cameraView")
-        # Стиль для области отображения камеры: черный фон, скругленные углы, белый текст
-        camera_style = '''
-        #cameraView {
-            background-color: black;
-            border-radius: 10px; 
-            color: white; 
-        }
-        '''
-        self.camera_view_label.setStyleSheet(camera_style)
-        layout.addWidget(self.camera_view_label, 0, 1)
+        # Виджет рисует кадры напрямую через QPainter (см. app/widgets/camera_view.py), без QLabel/QPixmap.
+        self.camera_view = CameraView(CAMERA_PLACEHOLDER_TEXT)
+        self.camera_view.setObjectName("cameraView")
+        layout.addWidget(self.camera_view, 0, 1)
 
         # --- Третья часть экрана (1,0): Заглушка/Информационная панель ---
         self.part3_placeholder = QWidget() # Виджет-заглушка, может быть заменен на что-то полезное
-        self.part3_placeholder.setAutoFillBackground(False) # Отключаем автозаливку
         self.part3_placeholder.setObjectName("infoPanel3")
-        # Неоморфический стиль для панели
-        panel_style = '''
-        #infoPanel3 {
-            background-color: #e0e0e0; /* Основной цвет фона, как у окна */
-            border-radius: 15px; /* Скругление углов */
-            border-width: 2px; /* Ширина границы */
-            border-style: solid; /* Стиль границы */
-            /* Цвета границ для эффекта "вдавленности/выпуклости" (сверху-слева светлее, снизу-справа темнее) */
-            border-color: #c0c0c0 #f0f0f0 #f0f0f0 #c0c0c0; /* top right bottom left */
-        }
-        '''
-        self.part3_placeholder.setStyleSheet(panel_style)
+        self.part3_placeholder.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        # Содержимое панели (статус сети) создается до добавления панели в сетку,
+        # чтобы сетка сразу получила окончательные размеры панели.
+        part3_layout = QVBoxLayout(self.part3_placeholder) # Конструктор с родителем сам устанавливает компоновку
+        part3_layout.setContentsMargins(15, 15, 15, 15) 
+        part3_layout.setAlignment(Qt.AlignCenter) # Qt.AlignmentFlag.AlignCenter -> Qt.AlignCenter
+
+        self.network_status_label = QLabel(NETWORK_STATUS_PLACEHOLDER_TEXT)
+        self.network_status_label.setObjectName("networkStatusLabel")
+        self.network_status_label.setAlignment(Qt.AlignCenter) # Qt.AlignmentFlag.AlignCenter -> Qt.AlignCenter
+
+        part3_layout.addStretch(1) 
+        part3_layout.addWidget(self.network_status_label)
+        part3_layout.addStretch(1)
+
         layout.addWidget(self.part3_placeholder, 1, 0)
 
         # --- Четвертая часть экрана (1,1): Управление GPIO ---
@@ -90,118 +240,156 @@ class MainWindow(QMainWindow):
         # Контейнер для кнопок управления GPIO
         gpio_control_container = QWidget()
         gpio_control_container.setObjectName("gpioContainer")
-        # Стиль для контейнера GPIO: фон и скругление
-        gpio_container_style = '''
-        #gpioContainer {
-            background-color: #e0e0e0;
-            border-radius: 10px;
-        }
-        '''
-        gpio_control_container.setStyleSheet(gpio_container_style)
-        
+        gpio_control_container.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+
         # Вертикальный layout для кнопок GPIO внутри их контейнера
         gpio_layout = QVBoxLayout(gpio_control_container)
         gpio_layout.setContentsMargins(20, 20, 20, 20) # Отступы внутри контейнера
         gpio_layout.setSpacing(15) # Расстояние между кнопками
 
-        # Создание кнопок GPIO (self.gpio_button1 удалена, т.к. ее функция выполняется физической кнопкой)
-        self.gpio_button2 = QPushButton("GPIO Управление 2")
-        self.gpio_button3 = QPushButton("GPIO Управление 3")
-        self.gpio_button4 = QPushButton("GPIO Управление 4")
-
-        # Общий неоморфический стиль для кнопок GPIO
-        button_style = '''
-        QPushButton {
-            background-color: #e0e0e0; /* Фон кнопки */
-            color: #444; /* Цвет текста */
-            border-width: 2px; /* Ширина границы */
-            border-style: solid; /* Стиль границы */
-            /* Цвета границ для неоморфического эффекта (выпуклость) */
-            border-color: #f0f0f0 #c0c0c0 #c0c0c0 #f0f0f0; /* top right bottom left */
-            border-radius: 15px; /* Скругление углов */
-            padding: 15px; /* Внутренние отступы */
-            font-size: 14px; /* Размер шрифта */
-            font-family: "DejaVu Sans", Arial, sans-serif; /* Шрифт (DejaVu Sans как хороший вариант для Linux) */
-        }
-        QPushButton:pressed { /* Стиль для нажатой кнопки */
-            background-color: #d5d5d5; /* Слегка затемненный фон */
-            /* Инвертированные цвета границ для эффекта "вдавленности" */
-            border-color: #c0c0c0 #f0f0f0 #f0f0f0 #c0c0c0; 
-        }
-        '''
-        # Применение стиля ко всем кнопкам GPIO
-        self.gpio_button2.setStyleSheet(button_style)
-        self.gpio_button3.setStyleSheet(button_style)
-        self.gpio_button4.setStyleSheet(button_style)
-
-        # Добавление кнопок в QVBoxLayout
-        gpio_layout.addWidget(self.gpio_button2)
-        gpio_layout.addWidget(self.gpio_button3)
-        gpio_layout.addWidget(self.gpio_button4)
-
-        # Подключение сигналов `clicked` от кнопок к асинхронным методам GPIOController.
-        # self.gpio_button1 и его connect УДАЛЕНЫ.
-        self.gpio_button2.clicked.connect(lambda: asyncio.create_task(self.gpio_controller.control_gpio_2()))
-        self.gpio_button3.clicked.connect(lambda: asyncio.create_task(self.gpio_controller.control_gpio_3()))
-        self.gpio_button4.clicked.connect(lambda: asyncio.create_task(self.gpio_controller.control_gpio_4()))
+        # Создание кнопок GPIO по каналам GPIOController (кнопка GPIO17 удалена, т.к. ее функция
+        # выполняется физической кнопкой): добавление в QVBoxLayout и подключение сигнала `clicked`.
+        # Все кнопки подключены к одному слоту через functools.partial, создаваемый один раз при запуске.
+        self.gpio_buttons = []
+        for channel in self.gpio_controller.CONTROL_CHANNELS:
+            button = QPushButton(f"GPIO Управление {channel}")
+            gpio_layout.addWidget(button)
+            button.clicked.connect(functools.partial(self.on_gpio_button_clicked, channel))
+            self.gpio_buttons.append(button)
         
         # Подключение сигнала от GPIOController (например, после действия физической кнопки) к слоту для toast
         self.gpio_controller.shutdown_action_finished.connect(self.on_shutdown_action_toast)
 
         layout.addWidget(gpio_control_container, 1, 1) # Добавление контейнера с кнопками в сетку
         
-        # Инициализация и запуск обработчика камеры.
+        # Инициализация обработчика камеры (захват запускается в start()).
         # Параметры camera_index=1, capture_width=544, capture_height=288 установлены 
         # в соответствии с последними изменениями для использования внешней USB-камеры и ее специфического разрешения.
         self.camera_handler = CameraHandler(camera_index=1, capture_width=544, capture_height=288) 
         self.camera_handler.new_frame.connect(self.update_camera_view)
+        self.camera_view.set_grayscale(self.camera_handler.grayscale) # Формат кадров выбирается один раз
         self.camera_handler.camera_error.connect(self.show_camera_error)
-        self.camera_handler.start_capture()
+        # Кадры масштабируются в CameraHandler сразу до размера виджета камеры,
+        # поэтому CameraView выводит их без масштабирования при каждой отрисовке.
+        self.camera_view.display_size_changed.connect(self.camera_handler.set_display_size)
 
-        # Инициализация и запуск проверки сетевого соединения.
+        # Инициализация проверки сетевого соединения (мониторинг запускается в start()).
         # NetworkChecker теперь использует gpiozero.PingServer и управляет светодиодами (GPIO 21, 26).
         # Сигнал network_status_gui используется для обновления метки в GUI.
         self.network_checker = NetworkChecker()
         self.network_checker.network_status_gui.connect(self.update_network_status_label)
-        self.network_checker.start_monitoring()
-
-        # --- Настройка содержимого для self.part3_placeholder (статус сети) ---
-        # Эта секция была добавлена в Turn 31/32 для отображения статуса сети.
-        # Комментарии ниже описывают ее структуру.
-        if self.part3_placeholder.layout() is None:
-            part3_layout = QVBoxLayout(self.part3_placeholder)
-            self.part3_placeholder.setLayout(part3_layout)
-        else:
-            part3_layout = self.part3_placeholder.layout()
-        
-        part3_layout.setContentsMargins(15, 15, 15, 15) 
-        part3_layout.setAlignment(Qt.AlignCenter) # Qt.AlignmentFlag.AlignCenter -> Qt.AlignCenter
-
-        self.network_status_label = QLabel("Статус сети: ожидание...")
-        self.network_status_label.setObjectName("networkStatusLabel")
-        self.network_status_label.setAlignment(Qt.AlignCenter) # Qt.AlignmentFlag.AlignCenter -> Qt.AlignCenter
-        self.network_status_label.setStyleSheet(
-            "#networkStatusLabel { color: #424242; font-size: 15px; font-family: 'DejaVu Sans', Arial, sans-serif; }"
-        ) 
-
-        part3_layout.addStretch(1) 
-        part3_layout.addWidget(self.network_status_label)
-        part3_layout.addStretch(1)
 
         # Отображение окна в полноэкранном режиме в конце инициализации
         self.showFullScreen() 
+        # Создание QWebEngineView и загрузка виджета погоды (запуск процесса рендеринга Chromium) откладываются
+        # на WEATHER_INITIAL_LOAD_DELAY_MS: за это время окно отрисовывается, а камера открывается
+        # и показывает первые кадры, не дожидаясь инициализации QtWebEngine.
+        QTimer.singleShot(WEATHER_INITIAL_LOAD_DELAY_MS, self._load_weather_widget)
+        self.weather_refresh_timer.start()
         # self.resize(800, 600) # Можно использовать для отладки не в полноэкранном режиме
         
         # Сообщение в консоли отражает последние изменения: удаление GUI кнопки gpio_button1
         # и подключение обработчика для физической кнопки (через GPIOController).
-        print("MainWindow: Инициализация завершена. GUI кнопка 1 (GPIO17) удалена, обработчик физической кнопки подключен.")
+        _debug("MainWindow: Инициализация завершена. GUI кнопка 1 (GPIO17) удалена, обработчик физической кнопки подключен.")
         
-        # Атрибуты для управления всплывающими сообщениями (toast)
-        self.toast_label = None 
-        self.toast_timer = None 
+
+    async def start(self):
+        """
+        Запускает фоновые службы окна: захват видео и мониторинг сети.
+        Вызывается задачей в цикле событий (см. main.py), а не из __init__: start_capture и
+        start_monitoring создают задачи asyncio, которые должны планироваться в уже запущенном
+        цикле quamash, а не во время построения окна, когда цикл еще не работает.
+        """
+        self.camera_handler.start_capture()
+        self.network_checker.start_monitoring()
+
+    def _load_weather_widget(self):
+        """
+        Создает QWebEngineView и загружает в него HTML виджета погоды.
+        Вызывается после показа окна и затем по таймеру обновления; после загрузки
+        страница заменяется статическим снимком (_snapshot_weather_widget).
+        Если снимок уже есть, он остается на экране поверх загружающейся страницы;
+        страница показывается только при первой загрузке, когда снимка еще нет.
+        """
+        if self.weather_widget_view is not None: # Предыдущая загрузка не завершилась (например, нет сети)
+            self._drop_weather_view()
+
+        view = QWebEngineView() # Виджет для отображения веб-страниц
+        view.setPage(QWebEnginePage(self._get_weather_profile(), view)) # Страница в постоянном профиле
+        view.loadFinished.connect(functools.partial(self._on_weather_loaded, view))
+        self.weather_layout.addWidget(view)
+        if self.weather_snapshot_label.pixmap() is None: # Первая загрузка: показываем саму страницу
+            self.weather_layout.setCurrentWidget(view)
+        else:
+            self.weather_snapshot_label.raise_() # Новый виджет добавлен поверх; снимок остается видимым
+        view.setHtml(WEATHER_WIDGET_HTML, baseUrl=QUrl(WEATHER_WIDGET_BASE_URL)) # Загрузка HTML
+        self.weather_widget_view = view
+
+    def _get_weather_profile(self):
+        """
+        Возвращает постоянный профиль QtWebEngine для виджета погоды, создавая его при первом вызове.
+        Именованный профиль с явно заданным дисковым HTTP-кэшем: скрипты и изображения виджета
+        при каждом обновлении снимка и после перезапуска берутся из кэша, а не загружаются заново,
+        независимо от настроек профиля по умолчанию (в Qt6 он off-the-record и хранит кэш в памяти).
+        Настройки страницы задаются один раз при создании профиля, а не при каждом обновлении.
+        """
+        if self.weather_profile is not None:
+            return self.weather_profile
+        profile = QWebEngineProfile(WEATHER_PROFILE_NAME, self)
+        profile.setHttpCacheType(QWebEngineProfile.DiskHttpCache)
+        # Каталоги кэша и хранилища по умолчанию берутся из QStandardPaths для имени профиля.
+
+        # Предварительное разрешение DNS ускоряет загрузку скриптов и изображений виджета
+        # с доменов сервиса погоды; локальное хранилище позволяет виджету кэшировать свои данные.
+        settings = profile.settings()
+        settings.setAttribute(QWebEngineSettings.DnsPrefetchEnabled, True)
+        settings.setAttribute(QWebEngineSettings.LocalStorageEnabled, True)
+        # Виджету погоды не нужны WebGL, аппаратный canvas и плагины: без них страница не создает
+        # GPU-контекстов, что вместе с --disable-gpu (см. main.py) снижает нагрузку на CPU/GPU и память Raspberry Pi.
+        # JavaScript остается включенным: без него виджет не отрисовывает данные.
+        settings.setAttribute(QWebEngineSettings.WebGLEnabled, False)
+        settings.setAttribute(QWebEngineSettings.Accelerated2dCanvasEnabled, False)
+        settings.setAttribute(QWebEngineSettings.PluginsEnabled, False)
+        settings.setAttribute(QWebEngineSettings.ScrollAnimatorEnabled, False)
+        self.weather_profile = profile
+        return profile
+
+    def _on_weather_loaded(self, view, ok):
+        """
+        Слот loadFinished: планирует снимок страницы после того, как скрипт виджета отрисует данные.
+        При ошибке загрузки на экране остается прежний снимок (или, при первой загрузке, сама страница)
+        до следующего обновления по таймеру.
+        """
+        if ok:
+            QTimer.singleShot(WEATHER_RENDER_DELAY_MS, functools.partial(self._snapshot_weather_widget, view))
+
+    def _snapshot_weather_widget(self, view):
+        """Заменяет страницу погоды ее снимком и освобождает QWebEngineView."""
+        if view is not self.weather_widget_view: # Снимок устаревшей загрузки
+            return
+        self.weather_snapshot_label.setPixmap(view.grab()) # Страница видима (под снимком), поэтому grab() ее отрисовывает
+        self.weather_layout.setCurrentWidget(self.weather_snapshot_label)
+        self.weather_snapshot_label.raise_()
+        self._drop_weather_view()
+
+    def _drop_weather_view(self):
+        """Удаляет текущий QWebEngineView; после этого Chromium завершает процесс рендеринга страницы."""
+        self.weather_layout.removeWidget(self.weather_widget_view)
+        self.weather_widget_view.deleteLater()
+        self.weather_widget_view = None
+
+    def on_gpio_button_clicked(self, channel, checked=False):
+        """
+        Слот кнопок GPIO: запускает асинхронное управление каналом в GPIOController.
+        Args:
+            channel (int): Номер канала из GPIOController.CONTROL_CHANNELS.
+            checked (bool): Аргумент сигнала clicked (не используется).
+        """
+        self._loop.create_task(self.gpio_controller.control(channel))
 
     # Новый слот для отображения toast-сообщений от GPIOController,
     # в частности, после выполнения действия закрытия браузера (по нажатию физической кнопки).
+    @pyqtSlot(str) # Slot -> pyqtSlot
     def on_shutdown_action_toast(self, message):
         """Отображает toast-сообщение, полученное от GPIOController (например, о статусе закрытия Chromium)."""
         self.show_toast(message, duration=4000)
@@ -214,97 +402,96 @@ class MainWindow(QMainWindow):
             message (str): Текст сообщения.
             duration (int): Длительность отображения в миллисекундах.
         """
-        # Если уже есть активное сообщение, удаляем его и останавливаем таймер
-        if self.toast_label:
-            self.toast_label.deleteLater() 
-            self.toast_label = None
-        if self.toast_timer and self.toast_timer.isActive():
-            self.toast_timer.stop()
-            self.toast_timer = None
-
-        # Создание нового QLabel для сообщения
-        self.toast_label = QLabel(message, self) # `self` (MainWindow) как родитель
-        self.toast_label.setObjectName("toastLabel")
-        # Стиль для всплывающего сообщения
-        toast_style = """
-        #toastLabel {
-            background-color: rgba(0, 0, 0, 180); /* Полупрозрачный черный фон */
-            color: white; /* Белый текст */
-            padding: 10px; /* Внутренние отступы */
-            border-radius: 8px; /* Скругленные углы */
-            font-size: 14px;
-            font-family: "DejaVu Sans", Arial, sans-serif; 
-        }
-        """
-        self.toast_label.setStyleSheet(toast_style)
+        # Новое сообщение заменяет текущее в той же метке; повторный start() перезапускает таймер.
+        self.toast_label.setText(message)
         self.toast_label.adjustSize() # Автоматический подбор размера метки под текст
         
-        # Позиционирование сообщения внизу по центру окна
-        x = (self.width() - self.toast_label.width()) // 2
-        y = self.height() - self.toast_label.height() - 20 # 20px отступ от нижнего края
+        # Позиционирование сообщения внизу по центру окна (размер окна запоминается в resizeEvent)
+        x = (self._window_width - self.toast_label.width()) // 2
+        y = self._window_height - self.toast_label.height() - 20 # 20px отступ от нижнего края
         self.toast_label.move(QPoint(x, y))
+        self.toast_label.raise_()
         self.toast_label.show() # Показать сообщение
 
-        # Таймер для автоматического скрытия сообщения
-        self.toast_timer = QTimer(self)
-        self.toast_timer.setSingleShot(True) # Таймер сработает один раз
-        self.toast_timer.timeout.connect(self._hide_toast) # Подключение слота для скрытия
-        self.toast_timer.start(duration) # Запуск таймера
+        self.toast_timer.start(duration) # Запуск (или перезапуск) таймера скрытия
+
 
-    def _hide_toast(self):
-        """Слот, вызываемый по таймауту для скрытия всплывающего сообщения."""
-        if self.toast_label:
-            self.toast_label.deleteLater() # Безопасное удаление виджета
-            self.toast_label = None
-        # Сбрасываем ссылку на таймер, т.к. он уже выполнил свою задачу
-        if self.toast_timer: 
-            self.toast_timer = None
+    @pyqtSlot(object) # Slot -> pyqtSlot; тип совпадает с сигналом CameraHandler.new_frame
+    def update_camera_view(self, frame):
+        """
+        Слот для обновления изображения с камеры в CameraView.
+        frame - непрерывный numpy-массив от CameraHandler: (H, W, 4) BGRA или (H, W) в оттенках серого.
+        Кадры, пришедшие, когда виджет камеры не виден (окно свернуто или скрыто), не отображаются.
+        """
+        if self.isMinimized() or not self.camera_view.isVisible():
+            return
+        self.camera_view.set_frame(frame)
 
+    def resizeEvent(self, event):
+        """Запоминает размер окна, используемый show_toast для позиционирования сообщения."""
+        super().resizeEvent(event)
+        size = event.size()
+        self._window_width, self._window_height = size.width(), size.height()
 
-    def update_camera_view(self, q_image):
-        """Слот для обновления изображения с камеры в QLabel."""
-        self.camera_view_label.setPixmap(QPixmap.fromImage(q_image))
+    def showEvent(self, event):
+        """При показе окна возобновляет захват видео, приостановленный в hideEvent."""
+        super().showEvent(event)
+        self.camera_handler.resume()
+
+    def hideEvent(self, event):
+        """
+        При скрытии (в т.ч. сворачивании) окна приостанавливает захват видео:
+        кадры не читаются с камеры и не обрабатываются, пока их некому показывать.
+        """
+        super().hideEvent(event)
+        self.camera_handler.pause()
 
     # Новый слот для обновления QLabel статуса сети и показа toast при недоступности
+    @pyqtSlot(bool, str) # Slot -> pyqtSlot
     def update_network_status_label(self, is_available, message):
         """
         Обновляет текстовую метку статуса сети и ее цвет.
         Также показывает всплывающее сообщение (toast) при недоступности сети.
         """
         self.network_status_label.setText(message)
-        base_style = "#networkStatusLabel {{ font-size: 15px; font-family: 'DejaVu Sans', Arial, sans-serif; color: {color}; }}"
-        if is_available:
-            # Зеленый цвет для текста, если сеть доступна
-            self.network_status_label.setStyleSheet(base_style.format(color="#2E7D32")) # темно-зеленый
-            # Можно добавить show_toast для подтверждения восстановления сети, если это необходимо
-            # self.show_toast("Сеть восстановлена", duration=3000) 
-        else:
-            # Красный цвет для текста, если сеть недоступна
-            self.network_status_label.setStyleSheet(base_style.format(color="#C62828")) # темно-красный
+        # Цвет задается правилами #networkStatusLabel[state=...] в APP_STYLESHEET: меняется только
+        # свойство виджета и стиль пересчитывается (unpolish/polish) без повторного разбора QSS.
+        self.network_status_label.setProperty("state", "ok" if is_available else "bad")
+        style = self.network_status_label.style()
+        style.unpolish(self.network_status_label)
+        style.polish(self.network_status_label)
+        if not is_available:
             self.show_toast(f"Сеть: {message}", duration=4000) # Показываем toast при ошибке/недоступности
+        # Можно добавить show_toast для подтверждения восстановления сети, если это необходимо
+        # self.show_toast("Сеть восстановлена", duration=3000) 
         
-        print(f"GUI Обновлен (метка статуса сети): {message}")
+        _debug(f"GUI Обновлен (метка статуса сети): {message}")
 
     # Старый слот update_network_status_display удален, так как его функциональность
     # полностью покрывается update_network_status_label и он больше не подключен к активному сигналу.
 
+    @pyqtSlot(str) # Slot -> pyqtSlot
     def show_camera_error(self, error_message):
         """
         Слот для отображения ошибок камеры через всплывающее сообщение.
         """
-        # self.camera_view_label.setText(f"Ошибка камеры:\n{error_message}") # Можно также обновлять текст в QLabel камеры
-        print(f"Camera Error: {error_message}") # Дублируем в консоль для отладки
+        # self.camera_view.placeholder_text = f"Ошибка камеры:\n{error_message}" # Можно также обновлять текст в виджете камеры
+        _warning(f"Camera Error: {error_message}") # Дублируем в консоль для отладки
         self.show_toast(f"Ошибка камеры: {error_message}", duration=5000)
 
 
     def closeEvent(self, event):
         """
         Обработчик события закрытия окна.
-        Останавливает все фоновые процессы (камера, проверка сети) перед закрытием.
+        Останавливает все фоновые процессы (камера, проверка сети) и освобождает GPIO
+        (кнопка, процесс mpg123) перед закрытием.
         """
-        print("Завершение работы: остановка фоновых служб...")
+        _debug("Завершение работы: остановка фоновых служб...")
         if hasattr(self, 'camera_handler') and self.camera_handler:
             self.camera_handler.stop_capture()
+            self.camera_handler.wait_released() # Камера освобождается до выхода из приложения
         if hasattr(self, 'network_checker') and self.network_checker:
             self.network_checker.stop_monitoring()
+        if hasattr(self, 'gpio_controller') and self.gpio_controller:
+            self.gpio_controller.close()
         super().closeEvent(event) # Вызов стандартного обработчика для завершения закрытия
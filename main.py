@@ -1,8 +1,10 @@
 # main.py
+import os
 import sys
 import asyncio
 import traceback
 from PyQt5.QtWidgets import QApplication, QMessageBox # PySide6 -> PyQt5
+from PyQt5.QtCore import QLoggingCategory # PySide6 -> PyQt5
 from app.window import MainWindow 
 import quamash
 
@@ -47,11 +49,51 @@ def global_exception_handler(exctype, value, tb):
     error_handler_active = False # Сброс флага в конце
     # sys.exit(1) # Раскомментируйте, если нужно принудительное завершение после ошибки
 
+def run_qt_event_loop(app, loop):
+    """
+    Запускает цикл событий Qt (app.exec_()), регистрируя loop как работающий цикл asyncio.
+    quamash 0.6 сам этого не делает, поэтому без регистрации все вызовы, которым нужен работающий цикл
+    (asyncio.create_task, asyncio.sleep, asyncio.wait_for, asyncio.Event/Queue, asyncio.to_thread),
+    внутри задач завершаются ошибкой RuntimeError('no running event loop').
+    Args:
+        app (QApplication): Экземпляр приложения.
+        loop (quamash.QEventLoop): Цикл asyncio, установленный через asyncio.set_event_loop.
+    Returns:
+        int: Код возврата app.exec_().
+    """
+    # Обход ограничения quamash 0.6: его QEventLoop не вызывает _set_running_loop ни в run_forever,
+    # ни при запуске через app.exec_(), а asyncio (Python 3.7+) проверяет работающий цикл через
+    # get_running_loop(). _set_running_loop - внутренняя функция asyncio (та же, что использует
+    # BaseEventLoop.run_forever); при обновлении Python или замене quamash (например, на qasync,
+    # который регистрирует цикл сам) этот вызов нужно проверить или убрать.
+    asyncio.events._set_running_loop(loop)
+    try:
+        return app.exec_() # exec() -> exec_()
+    finally:
+        asyncio.events._set_running_loop(None)
+
+def report_task_exception(task):
+    """Callback завершения фоновой задачи: передает ее исключение в global_exception_handler, а не теряет его."""
+    if not task.cancelled() and task.exception() is not None:
+        e = task.exception()
+        global_exception_handler(type(e), e, e.__traceback__)
+
 if __name__ == '__main__':
     # Установка глобального обработчика исключений для всего приложения.
     # Этот хук будет вызван для любых необработанных исключений, возникших в любом потоке.
     sys.excepthook = global_exception_handler
 
+    # Флаги Chromium для QtWebEngine (виджет погоды) должны быть заданы до создания QApplication.
+    # --disable-gpu: статической странице не нужен отдельный GPU-процесс, страница рисуется программно.
+    # --disable-features: отключение неиспользуемых в киоске служб Chromium (перевод страниц, трансляция).
+    # Значение из окружения, если оно задано, имеет приоритет.
+    os.environ.setdefault("QT_WEBENGINE_CHROMIUM_FLAGS", "--disable-gpu --disable-features=Translate,MediaRouter")
+
+    # Отладочный вывод GUI (категория kiosk.gui, см. app/window.py) выключен по умолчанию: при передаче
+    # через console/journald на SD-карте запись в stdout может заметно задерживать GUI-поток.
+    # Правила задаются один раз для всего приложения; QT_LOGGING_RULES имеет приоритет над ними.
+    QLoggingCategory.setFilterRules("kiosk.gui.debug=false")
+
     try:
         # Создание экземпляра QApplication - это основа любого PyQt приложения.
         # sys.argv позволяет передавать аргументы командной строки в приложение.
@@ -65,14 +107,18 @@ if __name__ == '__main__':
         # Создание главного окна приложения. Логика окна описана в app/window.py.
         window = MainWindow()
         window.show() # Отображение главного окна.
+        # Фоновые службы окна (камера, мониторинг сети) запускаются задачей в цикле quamash:
+        # она выполнится на первой итерации цикла, когда он уже будет запущен в run_qt_event_loop.
+        start_task = loop.create_task(window.start())
+        start_task.add_done_callback(report_task_exception)
 
         # Запуск основного цикла событий приложения.
         # `loop` (Quamash QEventLoop) здесь используется как контекстный менеджер,
         # чтобы обеспечить корректное управление его жизненным циклом.
-        # `app.exec_()` запускает цикл событий PyQt, который теперь интегрирован с asyncio.
+        # `run_qt_event_loop` запускает цикл событий PyQt (`app.exec_()`), зарегистрированный как работающий цикл asyncio.
         # `sys.exit()` обеспечивает корректное завершение приложения с кодом возврата.
         with loop:
-            sys.exit(app.exec_()) # exec() -> exec_()
+            sys.exit(run_qt_event_loop(app, loop))
             
     except Exception as e:
         # Этот блок try...except предназначен для перехвата исключений,
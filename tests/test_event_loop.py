@@ -0,0 +1,53 @@
+# tests/test_event_loop.py
+# Дымовой тест запуска фоновых задач в цикле quamash так же, как это делает main.py.
+import asyncio
+import os
+
+import pytest
+
+pytest.importorskip("quamash")
+pytest.importorskip("cv2")
+pytest.importorskip("PyQt5.QtWebEngineWidgets") # main.py импортирует app.window (QtWebEngine)
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import quamash
+from PyQt5.QtCore import QTimer # PySide6 -> PyQt5
+from PyQt5.QtWidgets import QApplication # PySide6 -> PyQt5
+
+from main import run_qt_event_loop
+from app.logic.camera_handler import CameraHandler
+
+
+def _run_for(app, loop, msec):
+    """Крутит цикл событий msec миллисекунд через run_qt_event_loop."""
+    QTimer.singleShot(msec, app.quit)
+    run_qt_event_loop(app, loop)
+
+
+def test_capture_runs_to_completion_on_quamash_loop():
+    app = QApplication.instance() or QApplication([])
+    loop = quamash.QEventLoop(app)
+    asyncio.set_event_loop(loop)
+    # Несуществующая камера и одна попытка открытия: цикл захвата проходит открытие в потоке камеры
+    # (run_in_executor), asyncio.Queue/Event и завершается сообщением camera_error.
+    handler = CameraHandler(camera_index=99)
+    handler.MAX_OPEN_ATTEMPTS = 1
+    errors = []
+    handler.camera_error.connect(errors.append)
+
+    async def start():
+        handler.start_capture()
+
+    try:
+        with loop:
+            start_task = loop.create_task(start())
+            _run_for(app, loop, 1000)
+            assert start_task.done() and start_task.exception() is None
+            assert errors, "camera_error не был отправлен: цикл захвата не выполнился"
+            assert not handler.running
+
+            handler.stop_capture()
+            handler.wait_released()
+    finally:
+        asyncio.set_event_loop(None)